@@ -1,13 +1,52 @@
+import os
 import sys
+import threading
 from PyQt6.QtWidgets import (
     QMainWindow, QApplication, QVBoxLayout, QWidget, QPushButton,
-    QTextEdit, QMenuBar, QLabel, QStatusBar, QHBoxLayout
+    QTextEdit, QMenuBar, QLabel, QStatusBar, QHBoxLayout, QFileDialog, QMessageBox
 )
-from PyQt6.QtGui import QPalette, QColor, QAction
-from PyQt6.QtCore import Qt, pyqtSlot
+from PyQt6.QtGui import QPalette, QColor, QAction, QTextCursor
+from PyQt6.QtCore import Qt, pyqtSlot, QThread, pyqtSignal, QObject
 
 from app.modules.tts_module import TTSModule
+from app.modules.clipboard_popup import ClipboardPopup
 from app.services.ai_service import AIService
+from app.services.document_service import DocumentService
+from app.services.provider_router import ProviderRouter
+from app.services.document_model import DocumentModel
+
+# Worker thread for document extraction
+class DocumentLoadWorkerSignals(QObject):
+    finished = pyqtSignal()
+    chunk = pyqtSignal(str, str)  # path, text
+    document_loaded = pyqtSignal(str, str)  # path, error message ("" on success)
+
+class DocumentLoadWorker(QObject):
+    def __init__(self, document_service, paths):
+        super().__init__()
+        self.document_service = document_service
+        self.paths = paths
+        self.cancel_event = threading.Event()  # Set from the GUI thread to stop loading
+        self.signals = DocumentLoadWorkerSignals()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            for path, index, payload in self.document_service.iter_extract(self.paths, self.cancel_event):
+                if index is None:
+                    self.signals.document_loaded.emit(path, payload or "")
+                else:
+                    self.signals.chunk.emit(path, payload)
+        except Exception as e:
+            self.signals.document_loaded.emit("", f"Document Error: {e}")
+        finally:
+            self.signals.finished.emit()
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -17,6 +56,14 @@ class MainWindow(QMainWindow):
 
         # Initialize services
         self.ai_service = AIService()
+        self.ai_router = ProviderRouter(self.ai_service)  # Picks local or remote engines per request
+        self.document_model = DocumentModel()  # Single shared copy of the document text
+        self.document_service = DocumentService()
+
+        # Document loading thread management
+        self.doc_thread = None
+        self.doc_worker = None
+        self.loading_path = None
 
         # --- Central Widget & Layout ---
         self.central_widget = QWidget()
@@ -26,7 +73,7 @@ class MainWindow(QMainWindow):
         # --- Text Input Area ---
         self.text_edit = QTextEdit()
         self.text_edit.setPlaceholderText("Enter text here or load a document...")
-        self.text_edit.textChanged.connect(self.on_text_changed)
+        self.text_edit.document().contentsChange.connect(self.on_contents_change)
         self.main_layout.addWidget(self.text_edit)
 
         # --- Document Controls ---
@@ -45,8 +92,9 @@ class MainWindow(QMainWindow):
         self.tts_label.setStyleSheet("font-weight: bold; font-size: 14px;")
         self.main_layout.addWidget(self.tts_label)
         
-        self.tts_module = TTSModule(self.ai_service)
+        self.tts_module = TTSModule(self.ai_router)
         self.main_layout.addWidget(self.tts_module)
+        self.document_model.add_listener(self.on_document_changed)
 
         # --- Placeholders for other modules ---
         self.stt_label = QLabel("Speech-to-Text")
@@ -73,6 +121,11 @@ class MainWindow(QMainWindow):
         self.setMenuBar(self.menu_bar)
         self.setup_menus()
 
+        # --- Clipboard Quick-Action Pop-up ---
+        # Created once and kept hidden so copy events and hotkeys only need to show it
+        self.clipboard_popup = ClipboardPopup(self.ai_router)
+        self.clipboard_popup.open_main_requested.connect(self.bring_to_front)
+
         # --- Theme ---
         self.is_dark_mode = False
         self._apply_theme()  # Apply initial theme
@@ -127,6 +180,10 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
 
+        latency_action = QAction("Quick Action Latency", self)
+        latency_action.triggered.connect(self.show_quick_action_latency)
+        help_menu.addAction(latency_action)
+
     @pyqtSlot()
     def toggle_theme(self):
         self.is_dark_mode = not self.is_dark_mode
@@ -160,27 +217,132 @@ class MainWindow(QMainWindow):
         QApplication.instance().setPalette(palette)
         self.status_bar.showMessage(f"Switched to {'Dark' if self.is_dark_mode else 'Light'} Mode")
 
-    def on_text_changed(self):
-        # Update the text for TTS module whenever text changes
-        current_text = self.text_edit.toPlainText()
-        self.tts_module.set_text(current_text)
+    @pyqtSlot(int, int, int)
+    def on_contents_change(self, position, chars_removed, chars_added):
+        # Apply only the edited range to the document model instead of
+        # copying the whole text on every keystroke
+        document = self.text_edit.document()
+        document_length = document.characterCount() - 1  # Excludes the trailing block separator
+        cursor = QTextCursor(document)
+        cursor.setPosition(min(position, document_length))
+        cursor.setPosition(min(position + chars_added, document_length), QTextCursor.MoveMode.KeepAnchor)
+        added_text = cursor.selectedText().replace("\u2029", "\n")
+        self.document_model.replace(position, chars_removed, added_text)
+
+        if len(self.document_model) != document_length:
+            # Qt can over-report a change around the final block separator; resync
+            self.document_model.set_text(self.text_edit.toPlainText())
+
+    def on_document_changed(self, snapshot, change):
+        # Modules receive the shared snapshot rather than their own copy of the text
+        self.tts_module.set_snapshot(snapshot)
 
     def on_new_document(self):
+        self.cancel_document_load()
         self.text_edit.clear()
         self.status_bar.showMessage("New document created")
 
     def on_open_document(self):
-        # This is a placeholder - would implement file dialog and loading
-        self.status_bar.showMessage("Document open dialog would appear here")
+        if self.doc_thread is not None:
+            self.status_bar.showMessage("Documents are still loading...")
+            return
+
+        paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "Open Document",
+            "",
+            "Documents (*.pdf *.docx *.txt);;All Files (*)"
+        )
+        if not paths:
+            return
+
+        self.text_edit.clear()
+        self.loading_path = None
+        self.open_doc_button.setEnabled(False)
+        self.document_service.start()  # Worker processes are started from the GUI thread
+        self.status_bar.showMessage(f"Loading {len(paths)} document(s)...")
+
+        # Extraction runs in the document service's process pool; this thread
+        # only relays streamed chunks to the GUI
+        self.doc_thread = QThread()
+        self.doc_worker = DocumentLoadWorker(self.document_service, paths)
+        self.doc_worker.moveToThread(self.doc_thread)
+
+        self.doc_worker.signals.chunk.connect(self.on_document_chunk)
+        self.doc_worker.signals.document_loaded.connect(self.on_document_loaded)
+        self.doc_worker.signals.finished.connect(self.on_document_load_finished)
+
+        self.doc_thread.started.connect(self.doc_worker.run)
+        self.doc_worker.signals.finished.connect(self.doc_thread.quit)
+        self.doc_worker.signals.finished.connect(self.doc_worker.deleteLater)
+        self.doc_thread.finished.connect(self.doc_thread.deleteLater)
+
+        self.doc_thread.start()
+
+    def cancel_document_load(self, wait=False):
+        """
+        Stop an in-flight document load.
+
+        Args:
+            wait (bool): Block until the loader thread has exited
+        """
+        if self.doc_worker is not None:
+            self.doc_worker.cancel()
+        if wait and self.doc_thread is not None:
+            self.doc_thread.quit()
+            self.doc_thread.wait()
+
+    def _is_current_load(self):
+        # Chunks queued before a cancellation may still be delivered; drop them
+        return self.doc_worker is not None and not self.doc_worker.is_cancelled()
+
+    @pyqtSlot(str, str)
+    def on_document_chunk(self, path, text):
+        if not self._is_current_load():
+            return
+        cursor = self.text_edit.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if path != self.loading_path:
+            # Separate consecutive documents with a blank line
+            if not self.text_edit.document().isEmpty():
+                cursor.insertText("\n\n")
+            self.loading_path = path
+        elif not self.text_edit.document().isEmpty():
+            cursor.insertText("\n")
+        cursor.insertText(text)
+
+    @pyqtSlot(str, str)
+    def on_document_loaded(self, path, error):
+        if not self._is_current_load():
+            return
+        if error:
+            QMessageBox.warning(self, "Open Document", f"{os.path.basename(path)}: {error}" if path else error)
+        else:
+            self.status_bar.showMessage(f"Loaded {os.path.basename(path)}")
+
+    @pyqtSlot()
+    def on_document_load_finished(self):
+        self.doc_thread = None
+        self.doc_worker = None
+        self.open_doc_button.setEnabled(True)
 
     def on_save_document(self):
         # This is a placeholder - would implement file dialog and saving
         self.status_bar.showMessage("Document save dialog would appear here")
 
+    @pyqtSlot()
+    def bring_to_front(self):
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
     def show_about(self):
         # This is a placeholder - would implement an About dialog
         self.status_bar.showMessage("AI Text & Audio Tool - A versatile text and audio processing application")
 
+    def show_quick_action_latency(self):
+        self.status_bar.showMessage(self.clipboard_popup.format_latency_summary())
+
     def set_demo_text(self):
         demo_text = "Welcome to the AI-Powered Text and Audio Tool. This application is designed to improve text and audio workflows for users who need accessibility features, content creators, and anyone who works extensively with text and audio."
         self.text_edit.setPlainText(demo_text)
@@ -188,4 +350,9 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         # Clean up resources when closing the application
         self.tts_module.cleanup()
+        self.clipboard_popup.cleanup()
+        self.clipboard_popup.close()
+        # Stop the loader thread before its worker processes and queue go away
+        self.cancel_document_load(wait=True)
+        self.document_service.shutdown()
         event.accept()
\ No newline at end of file
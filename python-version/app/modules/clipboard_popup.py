@@ -0,0 +1,488 @@
+import os
+import time
+import tempfile
+from collections import deque
+from statistics import median
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QComboBox, QTextEdit, QApplication
+)
+from PyQt6.QtCore import Qt, pyqtSlot, QThread, pyqtSignal, QObject, QTimer, QUrl, QEvent
+from PyQt6.QtGui import QCursor
+from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
+
+try:
+    from pynput import keyboard
+except Exception:  # pynput needs a display / input backend; hotkeys are optional
+    keyboard = None
+
+# Latency targets for the quick-action path, in milliseconds
+POPUP_LATENCY_BUDGET_MS = 100
+
+# Seconds between keep-alive refreshes of the provider connection
+KEEP_ALIVE_INTERVAL_S = 60
+
+# Characters of the copied text shown in the pop-up
+PREVIEW_CHARS = 120
+
+def _remove_temp_file(path):
+    """Delete a synthesized audio file, but only if it lives in the temp directory."""
+    if path and os.path.exists(path):
+        try:
+            if os.path.dirname(path) == tempfile.gettempdir():
+                os.remove(path)
+        except Exception as e:
+            print(f"Error removing temp file {path}: {e}")
+
+# Worker running on a persistent thread, so quick actions never pay for thread start-up
+class QuickActionWorkerSignals(QObject):
+    result = pyqtSignal(int, str, str, int)  # request_id, action, payload, actual_tokens
+    error = pyqtSignal(int, str, str)  # request_id, action, error message
+
+class QuickActionWorker(QObject):
+    def __init__(self, ai_service):
+        super().__init__()
+        self.ai_service = ai_service
+        self.signals = QuickActionWorkerSignals()
+
+    @pyqtSlot(int, str, str, str)
+    def run_action(self, request_id, action, text, option):
+        try:
+            if action == "tts":
+                # Same synthesis path as the TTS module; the router serves
+                # short snippets from the local engine
+                payload, tokens = self.ai_service.synthesize_speech(text, option, 1.0)
+            elif action == "grammar":
+                payload, tokens = self.ai_service.correct_grammar(text)
+            elif action == "rewrite":
+                payload, tokens = self.ai_service.rewrite_text(text, option)
+            else:
+                raise ValueError(f"Unknown quick action: {action}")
+
+            if payload is None:
+                self.signals.error.emit(request_id, action, f"Quick action '{action}' failed.")
+            else:
+                self.signals.result.emit(request_id, action, payload, tokens)
+        except Exception as e:
+            self.signals.error.emit(request_id, action, f"Quick Action Error: {e}")
+
+    @pyqtSlot()
+    def warm_up(self):
+        try:
+            self.ai_service.warm_up()
+        except Exception as e:
+            print(f"Quick action warm-up error: {e}")
+
+    @pyqtSlot()
+    def refresh_connection(self):
+        try:
+            self.ai_service.refresh_connection()
+        except Exception as e:
+            print(f"Quick action keep-alive error: {e}")
+
+# Clipboard Quick-Action Pop-up
+class ClipboardPopup(QWidget):
+    """
+    Resident pop-up offering TTS, grammar correction and rewriting of copied text.
+
+    The window, media player and worker threads are created once at start-up and
+    the pop-up is only shown or hidden afterwards, so triggering it from a copy
+    event or hotkey does no construction work. TTS has its own worker so a
+    hotkey never waits behind a grammar or rewrite round trip. The pop-up is
+    shown without taking focus from the application the text was copied in.
+    """
+
+    action_requested = pyqtSignal(int, str, str, str)  # request_id, action, text, option
+    tts_requested = pyqtSignal(int, str, str, str)  # request_id, action, text, voice
+    warm_up_requested = pyqtSignal()
+    keep_alive_requested = pyqtSignal()
+    hotkey_triggered = pyqtSignal(str, float)  # action, key press time; emitted from the pynput thread
+    open_main_requested = pyqtSignal()
+
+    def __init__(self, ai_service, parent=None):
+        super().__init__(parent, Qt.WindowType.Tool | Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
+        # Keystrokes after Ctrl+C must keep going to the user's application;
+        # the pop-up is only activated when the user clicks into it
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.ai_service = ai_service
+        self.clip_text = ""
+        self.audio_file_path = None
+        self.voice = os.getenv("DEFAULT_VOICE", "Default Male")
+        self.enabled_on_copy = os.getenv("CLIPBOARD_POPUP_ENABLED", "True").lower() == "true"
+
+        # Media player is created up front so first playback does not pay for it
+        self.player = QMediaPlayer()
+        self.audio_output = QAudioOutput()
+        self.player.setAudioOutput(self.audio_output)
+
+        # Request bookkeeping per worker; results of superseded requests are ignored
+        self.request_id = 0
+        self.action_pending = False
+        self.tts_request_id = 0
+        self.tts_pending = False
+
+        # Latency instrumentation (perf_counter seconds)
+        self.trigger_time = None
+        self.awaiting_paint = False
+        self.awaiting_audio = False
+        self.latency_samples = {
+            "popup": deque(maxlen=50),
+            "audio": deque(maxlen=50),
+        }
+
+        self._init_ui()
+        self._start_worker()
+        self._connect_signals()
+        self._start_hotkeys()
+
+        # Auto-hide after a period without interaction
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.setInterval(10000)
+        self.hide_timer.timeout.connect(self.dismiss)
+
+        # Warm the local engine and provider once, then keep the provider
+        # connection alive without competing with quick actions
+        self.keep_alive_timer = QTimer(self)
+        self.keep_alive_timer.setInterval(KEEP_ALIVE_INTERVAL_S * 1000)
+        self.keep_alive_timer.timeout.connect(self.on_keep_alive)
+        self.keep_alive_timer.start()
+        self.warm_up_requested.emit()
+
+    def _init_ui(self):
+        layout = QVBoxLayout(self)
+
+        self.preview_label = QLabel("")
+        self.preview_label.setWordWrap(True)
+        self.preview_label.setStyleSheet("font-style: italic;")
+        layout.addWidget(self.preview_label)
+
+        # Quick actions
+        actions_layout = QHBoxLayout()
+        self.speak_button = QPushButton("Speak")
+        self.grammar_button = QPushButton("Fix Grammar")
+        self.rewrite_button = QPushButton("Rewrite")
+        self.style_combo = QComboBox()
+        self.style_combo.addItems(["formal", "informal", "creative", "technical", "academic"])
+        self.open_app_button = QPushButton("Open App")
+        self.close_button = QPushButton("x")
+        self.close_button.setFixedWidth(24)
+
+        actions_layout.addWidget(self.speak_button)
+        actions_layout.addWidget(self.grammar_button)
+        actions_layout.addWidget(self.rewrite_button)
+        actions_layout.addWidget(self.style_combo)
+        actions_layout.addWidget(self.open_app_button)
+        actions_layout.addWidget(self.close_button)
+        layout.addLayout(actions_layout)
+
+        # Result area for grammar / rewrite output
+        self.result_edit = QTextEdit()
+        self.result_edit.setReadOnly(True)
+        self.result_edit.setMaximumHeight(120)
+        self.result_edit.setVisible(False)
+        self.copy_result_button = QPushButton("Copy Result")
+        self.copy_result_button.setVisible(False)
+        layout.addWidget(self.result_edit)
+        layout.addWidget(self.copy_result_button)
+
+        self.status_label = QLabel("Ready")
+        layout.addWidget(self.status_label)
+
+        self.setLayout(layout)
+        self.setFixedWidth(480)
+        self.adjustSize()
+
+        # Widgets that need keyboard focus activate the pop-up when clicked
+        for widget in (self.style_combo, self.result_edit.viewport()):
+            widget.installEventFilter(self)
+
+    def _start_worker(self):
+        self.worker_thread = QThread()
+        self.worker = QuickActionWorker(self.ai_service)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker_thread.start()
+
+        self.tts_worker_thread = QThread()
+        self.tts_worker = QuickActionWorker(self.ai_service)
+        self.tts_worker.moveToThread(self.tts_worker_thread)
+        self.tts_worker_thread.start()
+
+    def _connect_signals(self):
+        # Button connections
+        self.speak_button.clicked.connect(lambda: self.run_action("tts"))
+        self.grammar_button.clicked.connect(lambda: self.run_action("grammar"))
+        self.rewrite_button.clicked.connect(lambda: self.run_action("rewrite"))
+        self.open_app_button.clicked.connect(self.on_open_app)
+        self.close_button.clicked.connect(self.dismiss)
+        self.copy_result_button.clicked.connect(self.copy_result)
+
+        # Worker connections (queued across threads)
+        self.action_requested.connect(self.worker.run_action)
+        self.tts_requested.connect(self.tts_worker.run_action)
+        self.warm_up_requested.connect(self.tts_worker.warm_up)
+        self.keep_alive_requested.connect(self.worker.refresh_connection)
+        for worker in (self.worker, self.tts_worker):
+            worker.signals.result.connect(self.on_action_result)
+            worker.signals.error.connect(self.on_action_error)
+
+        # Trigger connections
+        self.hotkey_triggered.connect(self.on_hotkey)
+        QApplication.clipboard().dataChanged.connect(self.on_clipboard_changed)
+
+        # Media player connections
+        self.player.playbackStateChanged.connect(self.playback_state_changed)
+        self.player.errorOccurred.connect(self.player_error)
+
+    def _start_hotkeys(self):
+        """Register global hotkeys; configurable via HOTKEY_QUICK_POPUP and HOTKEY_QUICK_TTS."""
+        self.hotkey_listener = None
+        if keyboard is None:
+            print("Global hotkeys unavailable: pynput could not be loaded")
+            return
+        # Timestamps are taken in the listener thread so measured latency
+        # includes the hand-off to the GUI thread
+        hotkeys = {
+            os.getenv("HOTKEY_QUICK_POPUP", "<ctrl>+<alt>+q"): lambda: self.hotkey_triggered.emit("popup", time.perf_counter()),
+            os.getenv("HOTKEY_QUICK_TTS", "<ctrl>+<alt>+s"): lambda: self.hotkey_triggered.emit("tts", time.perf_counter()),
+        }
+        try:
+            self.hotkey_listener = keyboard.GlobalHotKeys(hotkeys)
+            self.hotkey_listener.start()
+        except Exception as e:
+            print(f"Could not register global hotkeys: {e}")
+            self.hotkey_listener = None
+
+    # --- Triggers ---
+
+    @pyqtSlot()
+    def on_clipboard_changed(self):
+        clipboard = QApplication.clipboard()
+        if not self.enabled_on_copy or clipboard.ownsClipboard():
+            return  # Ignore copies made inside this application
+        self.show_for_clipboard()
+
+    @pyqtSlot(str, float)
+    def on_hotkey(self, action, pressed_at):
+        if action == "tts":
+            if self.show_for_clipboard(trigger_time=pressed_at):
+                self.run_action("tts", trigger_time=pressed_at)
+        else:
+            self.show_for_clipboard(trigger_time=pressed_at)
+
+    def show_for_clipboard(self, trigger_time=None):
+        """
+        Show the pop-up for the current clipboard text near the mouse cursor.
+
+        Args:
+            trigger_time (float, optional): perf_counter() time of the triggering
+                                            event; defaults to now
+
+        Returns:
+            bool: True if there was text to act on
+        """
+        self.trigger_time = trigger_time or time.perf_counter()
+        text = QApplication.clipboard().text().strip()
+        if not text:
+            return False
+
+        self.clip_text = text
+        preview = text if len(text) <= PREVIEW_CHARS else text[:PREVIEW_CHARS] + "..."
+        self.preview_label.setText(preview)
+        self.result_edit.setVisible(False)
+        self.copy_result_button.setVisible(False)
+        self.status_label.setText("Ready")
+        self._update_actions()
+
+        self.move(QCursor.pos())
+        self.awaiting_paint = True
+        self.show()
+        self.raise_()
+        self.update()  # Ensure a paint event even if the pop-up was already visible
+        self.hide_timer.start()
+        return True
+
+    # --- Actions ---
+
+    def run_action(self, action, trigger_time=None):
+        if not self.clip_text:
+            return
+        self.hide_timer.stop()
+        if action == "tts":
+            self.player.stop()
+            self.awaiting_audio = True
+            # Hotkeys measure from the key press; buttons from the click
+            self.trigger_time = trigger_time or time.perf_counter()
+            self.status_label.setText("Synthesizing...")
+            self.tts_request_id += 1
+            self.tts_pending = True
+            self._update_actions()
+            self.tts_requested.emit(self.tts_request_id, action, self.clip_text, self.voice)
+        else:
+            self.status_label.setText("Working...")
+            self.request_id += 1
+            self.action_pending = True
+            self._update_actions()
+            self.action_requested.emit(self.request_id, action, self.clip_text, self.style_combo.currentText())
+
+    def _is_current(self, request_id, action):
+        return request_id == (self.tts_request_id if action == "tts" else self.request_id)
+
+    def _finish(self, action):
+        if action == "tts":
+            self.tts_pending = False
+        else:
+            self.action_pending = False
+        self._update_actions()
+
+    @pyqtSlot(int, str, str, int)
+    def on_action_result(self, request_id, action, payload, actual_tokens):
+        if not self._is_current(request_id, action):
+            if action == "tts":
+                _remove_temp_file(payload)  # Never played, so nothing else will delete it
+            return  # Superseded by a newer request
+        self._finish(action)
+        if action == "tts":
+            self.player.setSource(QUrl())  # Release the previous file before deleting it
+            self._remove_audio_file()
+            self.audio_file_path = payload
+            self.player.setSource(QUrl.fromLocalFile(payload))
+            self.player.play()
+            self.status_label.setText(f"Speaking... Tokens: {actual_tokens}")
+        else:
+            self.result_edit.setPlainText(payload)
+            self.result_edit.setVisible(True)
+            self.copy_result_button.setVisible(True)
+            self.status_label.setText(f"Done. Tokens: {actual_tokens}")
+            self.adjustSize()
+            self.hide_timer.start()
+
+    @pyqtSlot(int, str, str)
+    def on_action_error(self, request_id, action, error_msg):
+        if not self._is_current(request_id, action):
+            return
+        self._finish(action)
+        if action == "tts":
+            self.awaiting_audio = False
+        self.status_label.setText(error_msg)
+        self.hide_timer.start()
+
+    @pyqtSlot()
+    def on_keep_alive(self):
+        # Never queue a refresh ahead of a pending quick action on the worker thread
+        if not self.action_pending:
+            self.keep_alive_requested.emit()
+
+    @pyqtSlot()
+    def copy_result(self):
+        QApplication.clipboard().setText(self.result_edit.toPlainText())
+        self.status_label.setText("Copied to clipboard")
+
+    @pyqtSlot()
+    def on_open_app(self):
+        self.dismiss()
+        self.open_main_requested.emit()
+
+    @pyqtSlot()
+    def dismiss(self):
+        self.hide_timer.stop()
+        self.hide()
+
+    def _update_actions(self):
+        self.speak_button.setEnabled(not self.tts_pending)
+        self.grammar_button.setEnabled(not self.action_pending)
+        self.rewrite_button.setEnabled(not self.action_pending)
+
+    # --- Focus ---
+
+    def mousePressEvent(self, event):
+        self.activateWindow()
+        super().mousePressEvent(event)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.MouseButtonPress and not self.isActiveWindow():
+            self.activateWindow()
+        return super().eventFilter(obj, event)
+
+    # --- Latency instrumentation ---
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.awaiting_paint and self.trigger_time is not None:
+            self.awaiting_paint = False
+            self._record_latency("popup", POPUP_LATENCY_BUDGET_MS)
+
+    @pyqtSlot(QMediaPlayer.PlaybackState)
+    def playback_state_changed(self, state):
+        if state == QMediaPlayer.PlaybackState.PlayingState and self.awaiting_audio:
+            self.awaiting_audio = False
+            self._record_latency("audio")
+        elif state == QMediaPlayer.PlaybackState.StoppedState and self.isVisible():
+            self.hide_timer.start()
+
+    @pyqtSlot()
+    def player_error(self):
+        self.awaiting_audio = False
+        self.status_label.setText(f"Player Error: {self.player.errorString()}")
+
+    def _record_latency(self, stage, budget_ms=None):
+        elapsed_ms = (time.perf_counter() - self.trigger_time) * 1000
+        self.latency_samples[stage].append(elapsed_ms)
+        print(f"Quick action latency: {stage} after {elapsed_ms:.1f} ms")
+        if budget_ms is not None and elapsed_ms > budget_ms:
+            print(f"Quick action latency: {stage} exceeded the {budget_ms} ms budget")
+        if stage == "audio":
+            self.trigger_time = None
+
+    def latency_summary(self):
+        """
+        Summarize recent trigger-to-popup and trigger-to-audio latencies.
+
+        Returns:
+            dict: Stage name -> (median_ms, max_ms, sample_count), or None for
+                  stages without samples
+        """
+        return {
+            stage: (median(samples), max(samples), len(samples)) if samples else None
+            for stage, samples in self.latency_samples.items()
+        }
+
+    def format_latency_summary(self):
+        """
+        Describe recent quick-action latencies in one line for the status bar.
+
+        Returns:
+            str: Median and worst latency per stage, and whether the pop-up
+                 stayed within its budget
+        """
+        summary = self.latency_summary()
+        parts = []
+        for stage, stats in summary.items():
+            if stats is None:
+                parts.append(f"{stage}: no samples")
+                continue
+            median_ms, max_ms, count = stats
+            parts.append(f"{stage}: median {median_ms:.0f} ms, max {max_ms:.0f} ms ({count} runs)")
+        popup = summary["popup"]
+        if popup is not None:
+            within = "within" if popup[0] <= POPUP_LATENCY_BUDGET_MS else "over"
+            parts.append(f"{within} the {POPUP_LATENCY_BUDGET_MS} ms pop-up budget")
+        return "Quick action latency - " + "; ".join(parts)
+
+    # --- Cleanup ---
+
+    def _remove_audio_file(self):
+        _remove_temp_file(self.audio_file_path)
+        self.audio_file_path = None
+
+    def cleanup(self):
+        """Stop hotkeys, the worker thread and playback when closing"""
+        self.keep_alive_timer.stop()
+        if self.hotkey_listener is not None:
+            self.hotkey_listener.stop()
+        self.player.stop()
+        self.player.setSource(QUrl())
+        self._remove_audio_file()
+        for thread in (self.worker_thread, self.tts_worker_thread):
+            thread.quit()
+            thread.wait()
@@ -17,10 +17,10 @@ class TTSWorkerSignals(QObject):
     progress = pyqtSignal(int)  # For progress bar
 
 class TTSWorker(QObject):
-    def __init__(self, ai_service, text, voice, speed):
+    def __init__(self, ai_service, snapshot, voice, speed):
         super().__init__()
         self.ai_service = ai_service
-        self.text = text
+        self.snapshot = snapshot  # Immutable document snapshot; no copy of the text is made
         self.voice = voice
         self.speed = speed
         self.signals = TTSWorkerSignals()
@@ -30,7 +30,7 @@ class TTSWorker(QObject):
         try:
             self.signals.progress.emit(10)  # Starting progress
             audio_file_path, actual_tokens = self.ai_service.synthesize_speech(
-                self.text, self.voice, self.speed
+                self.snapshot.text(), self.voice, self.speed
             )
             self.signals.progress.emit(90)  # Almost done
             
@@ -50,7 +50,7 @@ class TTSModule(QWidget):
     def __init__(self, ai_service, parent=None):
         super().__init__(parent)
         self.ai_service = ai_service
-        self.current_text = ""
+        self.snapshot = None  # DocumentSnapshot of the text to speak
         self.audio_file_path = None
         
         # Media player setup
@@ -156,18 +156,19 @@ class TTSModule(QWidget):
         self.player.mediaStatusChanged.connect(self.media_status_changed)
         self.player.errorOccurred.connect(self.player_error)
     
-    def set_text(self, text):
-        if text != self.current_text:
-            self.current_text = text
+    def set_snapshot(self, snapshot):
+        # Snapshots are immutable, so identity tells us whether the text changed
+        if snapshot is not self.snapshot:
+            self.snapshot = snapshot
             self.stop_playback()  # Stop if playing different text
             self.estimate_tokens()  # Estimate cost for new text
             self._update_button_states()
     
     def estimate_tokens(self):
-        if self.current_text:
+        if self.snapshot:
             try:
                 estimated_tokens = self.ai_service.estimate_tts_tokens(
-                    self.current_text, 
+                    self.snapshot, 
                     self.voice_combo.currentText()
                 )
                 self.token_label.setText(f"Est. Tokens: {estimated_tokens}")
@@ -211,14 +212,14 @@ class TTSModule(QWidget):
             self.player.setPosition(new_position)
     
     def synthesize_and_play(self):
-        if not self.current_text:
+        if not self.snapshot:
             QMessageBox.warning(self, "Warning", "No text to synthesize.")
             self.play_pause_button.setChecked(False)
             return
         
         # Token cost confirmation for large texts
         estimated_tokens = self.ai_service.estimate_tts_tokens(
-            self.current_text, 
+            self.snapshot, 
             self.voice_combo.currentText()
         )
         
@@ -245,7 +246,7 @@ class TTSModule(QWidget):
         self.worker_thread = QThread()
         self.worker = TTSWorker(
             self.ai_service,
-            self.current_text,
+            self.snapshot,
             self.voice_combo.currentText(),
             self.speed_slider.value() / 10.0
         )
@@ -338,7 +339,7 @@ class TTSModule(QWidget):
         self.estimate_tokens()
     
     def _update_button_states(self):
-        can_play = bool(self.current_text) or bool(self.audio_file_path)
+        can_play = bool(self.snapshot) or bool(self.audio_file_path)
         is_synthesizing = self.worker_thread is not None and self.worker_thread.isRunning()
         is_playing = self.player.playbackState() == QMediaPlayer.PlaybackState.PlayingState
         
@@ -19,6 +19,17 @@ class AIService:
         self.api_key = api_key  # In production, load from config/env var
         print("AI Service Initialized")
     
+    def warm_up(self):
+        """
+        Prepare the provider connection ahead of the first request.
+        In a real implementation, this would open or refresh a keep-alive
+        HTTPS session so quick actions do not pay for DNS and TLS setup.
+        
+        Returns:
+            bool: True if the provider is ready
+        """
+        return True
+    
     def estimate_tts_tokens(self, text, voice):
         """
         Estimate token usage for text-to-speech conversion.
@@ -0,0 +1,415 @@
+import bisect
+import hashlib
+from itertools import accumulate
+from collections import deque, namedtuple
+
+# Target size of rope leaves. Small enough that a keystroke only copies one
+# short string, large enough that the tree stays shallow for long documents.
+LEAF_SIZE = 1024
+
+# Number of recent edits kept for changes_since()
+CHANGE_LOG_SIZE = 256
+
+DocumentChange = namedtuple("DocumentChange", ["version", "start", "removed", "inserted"])
+DocumentChange.__doc__ = """
+An edit applied to the document.
+
+Fields:
+    version (int): Document version produced by this edit
+    start (int): Offset where the edit begins
+    removed (int): Number of characters removed at start
+    inserted (int): Number of characters inserted at start
+"""
+
+
+class _Leaf:
+    __slots__ = ("text", "length", "height")
+
+    def __init__(self, text):
+        self.text = text
+        self.length = len(text)
+        self.height = 0
+
+
+class _Branch:
+    __slots__ = ("left", "right", "length", "height")
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        self.length = left.length + right.length
+        self.height = max(left.height, right.height) + 1
+
+
+def _build(text):
+    """Build a perfectly balanced rope from a string."""
+    if not text:
+        return None
+    leaves = [_Leaf(text[i:i + LEAF_SIZE]) for i in range(0, len(text), LEAF_SIZE)]
+
+    def build_range(lo, hi):
+        if hi - lo == 1:
+            return leaves[lo]
+        mid = (lo + hi) // 2
+        return _Branch(build_range(lo, mid), build_range(mid, hi))
+
+    return build_range(0, len(leaves))
+
+
+def _join(a, b):
+    """Concatenate two ropes, rebalancing AVL-style along the joining spine."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if isinstance(a, _Leaf) and isinstance(b, _Leaf) and a.length + b.length <= LEAF_SIZE:
+        return _Leaf(a.text + b.text)  # Keep keystroke-sized fragments from piling up
+
+    if a.height > b.height + 1:
+        right = _join(a.right, b)
+        if right.height <= a.left.height + 1:
+            return _Branch(a.left, right)
+        if right.right.height >= right.left.height:
+            return _Branch(_Branch(a.left, right.left), right.right)
+        inner = right.left
+        return _Branch(_Branch(a.left, inner.left), _Branch(inner.right, right.right))
+
+    if b.height > a.height + 1:
+        left = _join(a, b.left)
+        if left.height <= b.right.height + 1:
+            return _Branch(left, b.right)
+        if left.left.height >= left.right.height:
+            return _Branch(left.left, _Branch(left.right, b.right))
+        inner = left.right
+        return _Branch(_Branch(left.left, inner.left), _Branch(inner.right, b.right))
+
+    return _Branch(a, b)
+
+
+def _split(node, pos):
+    """Split a rope at pos into (left, right)."""
+    if node is None:
+        return None, None
+    if pos <= 0:
+        return None, node
+    if pos >= node.length:
+        return node, None
+    if isinstance(node, _Leaf):
+        return _Leaf(node.text[:pos]), _Leaf(node.text[pos:])
+    if pos < node.left.length:
+        left, right = _split(node.left, pos)
+        return left, _join(right, node.right)
+    if pos > node.left.length:
+        left, right = _split(node.right, pos - node.left.length)
+        return _join(node.left, left), right
+    return node.left, node.right
+
+
+def _insert(node, pos, text):
+    """Insert a short string by rewriting only the leaf that contains pos."""
+    if node is None:
+        return _build(text)
+    if isinstance(node, _Leaf):
+        return _build(node.text[:pos] + text + node.text[pos:])
+    if pos <= node.left.length:
+        return _join(_insert(node.left, pos, text), node.right)
+    return _join(node.left, _insert(node.right, pos - node.left.length, text))
+
+
+def _iter_chunks(node, start, end):
+    """Yield the leaf strings covering [start, end) in order."""
+    if node is None or start >= end:
+        return
+    if isinstance(node, _Leaf):
+        if start <= 0 and end >= node.length:
+            yield node.text
+        else:
+            yield node.text[max(start, 0):end]
+        return
+    left_length = node.left.length
+    if start < left_length:
+        yield from _iter_chunks(node.left, start, min(end, left_length))
+    if end > left_length:
+        yield from _iter_chunks(node.right, start - left_length, end - left_length)
+
+
+class Rope:
+    """
+    Immutable rope (balanced tree of string chunks).
+
+    Edits return a new Rope in O(log n) and share every untouched chunk with the
+    original, so keeping old versions around costs almost nothing.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self, text=""):
+        self._root = _build(text)
+
+    @classmethod
+    def _from_root(cls, root):
+        rope = cls.__new__(cls)
+        rope._root = root
+        return rope
+
+    def __len__(self):
+        return self._root.length if self._root is not None else 0
+
+    def __str__(self):
+        return "".join(self.iter_chunks())
+
+    def _clamp(self, start, end):
+        length = len(self)
+        start = min(max(start, 0), length)
+        end = length if end is None else min(max(end, start), length)
+        return start, end
+
+    def iter_chunks(self, start=0, end=None):
+        """
+        Iterate over the text in [start, end) without building one large string.
+
+        Args:
+            start (int): Start offset
+            end (int, optional): End offset, defaults to the end of the text
+
+        Yields:
+            str: Consecutive pieces of the requested range
+        """
+        start, end = self._clamp(start, end)
+        return _iter_chunks(self._root, start, end)
+
+    def slice(self, start=0, end=None):
+        return "".join(self.iter_chunks(start, end))
+
+    def insert(self, pos, text):
+        if not text:
+            return self
+        pos, _ = self._clamp(pos, None)
+        if len(text) <= LEAF_SIZE:
+            return Rope._from_root(_insert(self._root, pos, text))
+        left, right = _split(self._root, pos)
+        return Rope._from_root(_join(_join(left, _build(text)), right))
+
+    def delete(self, start, end):
+        start, end = self._clamp(start, end)
+        if start == end:
+            return self
+        left, rest = _split(self._root, start)
+        _, right = _split(rest, end - start)
+        return Rope._from_root(_join(left, right))
+
+    def replace(self, start, end, text):
+        return self.delete(start, end).insert(start, text)
+
+
+class DocumentSnapshot:
+    """
+    Immutable, versioned view of the document.
+
+    Taking a snapshot is O(1) and does not copy the text, so workers can hold one
+    while the user keeps typing. For convenience a snapshot behaves like a
+    read-only string for len(), truth testing, slicing and str().
+    """
+
+    def __init__(self, rope, version, previous=None, change=None):
+        self.rope = rope
+        self.version = version
+        self._text = None
+        self._block_hashes = None
+        # Predecessor and the edit that produced this snapshot, kept until
+        # block hashes are computed so they can be carried forward
+        self._previous = previous
+        self._change = change
+
+    def __len__(self):
+        return len(self.rope)
+
+    def __bool__(self):
+        return len(self.rope) > 0
+
+    def __getitem__(self, key):
+        if isinstance(key, slice) and key.step in (None, 1):
+            start, stop, _ = key.indices(len(self.rope))
+            return self.rope.slice(start, stop)
+        return self.text()[key]
+
+    def __str__(self):
+        return self.text()
+
+    def text(self):
+        """
+        Return the full text, materializing it once per snapshot.
+
+        Returns:
+            str: The document text at this version
+        """
+        if self._text is None:
+            self._text = str(self.rope)
+        return self._text
+
+    def iter_chunks(self, start=0, end=None):
+        return self.rope.iter_chunks(start, end)
+
+    def block_hashes(self):
+        """
+        Hash each block (line / paragraph) of the text.
+
+        Blocks are hashed by content, so an edit only changes the hashes of the
+        blocks it touches, even though it shifts the offsets of everything after
+        it. When the previous snapshot already has hashes, only the blocks covered
+        by the edit are re-hashed.
+
+        Returns:
+            list: Hex digests, one per newline-separated block in document order
+        """
+        return self._blocks()[1]
+
+    def block_lengths(self):
+        """
+        Get the length of each block, matching block_hashes().
+
+        Returns:
+            list: Block lengths in characters, excluding the separating newline
+        """
+        return [span - 1 for span in self._blocks()[0]]
+
+    def _blocks(self):
+        if self._block_hashes is None:
+            previous = self._previous
+            if previous is not None and previous._block_hashes is not None:
+                self._block_hashes = self._carry_forward(previous._block_hashes, self._change)
+            else:
+                self._block_hashes = _hash_blocks(self.text())
+            self._previous = None
+            self._change = None
+        return self._block_hashes
+
+    def _carry_forward(self, blocks, change):
+        # Each block spans its length plus the following newline, so block k
+        # covers [starts[k], starts[k + 1] - 1] in the old text
+        spans, digests = blocks
+        starts = list(accumulate(spans, initial=0))
+        first = bisect.bisect_right(starts, change.start) - 1
+        last = bisect.bisect_right(starts, change.start + change.removed) - 1
+        last = min(last, len(spans) - 1)
+
+        region_start = starts[first]
+        region_end = starts[last + 1] - 1 + change.inserted - change.removed
+        new_spans, new_digests = _hash_blocks(self.rope.slice(region_start, region_end))
+        return (
+            spans[:first] + new_spans + spans[last + 1:],
+            digests[:first] + new_digests + digests[last + 1:],
+        )
+
+
+def _hash_blocks(text):
+    """Return (spans, digests) for the newline-separated blocks of text."""
+    blocks = text.split("\n")
+    spans = [len(block) + 1 for block in blocks]
+    digests = [hashlib.blake2b(block.encode("utf-8"), digest_size=16).hexdigest() for block in blocks]
+    return spans, digests
+
+
+class DocumentModel:
+    """
+    Central document model shared by the editor, modules and services.
+
+    Holds the text in a rope, applies incremental edits, hands out zero-copy
+    snapshots and notifies listeners with the range each edit changed.
+    """
+
+    def __init__(self, text=""):
+        self._snapshot = DocumentSnapshot(Rope(text), 0)
+        self._changes = deque(maxlen=CHANGE_LOG_SIZE)
+        self._listeners = []
+
+    @property
+    def version(self):
+        return self._snapshot.version
+
+    def __len__(self):
+        return len(self._snapshot)
+
+    def snapshot(self):
+        """
+        Get an immutable view of the current text.
+
+        Returns:
+            DocumentSnapshot: Snapshot of the current version
+        """
+        return self._snapshot
+
+    def add_listener(self, callback):
+        """
+        Register a callback invoked as callback(snapshot, change) after every edit.
+
+        Args:
+            callback (callable): Listener to add
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def replace(self, start, removed, text):
+        """
+        Replace a range of the document.
+
+        Args:
+            start (int): Offset where the edit begins
+            removed (int): Number of characters to remove
+            text (str): Text to insert at start
+
+        Returns:
+            DocumentSnapshot: Snapshot after the edit
+        """
+        # Clamp like Rope does so listeners and carried-forward block hashes see
+        # the range that was actually edited, not an over-reported one
+        length = len(self)
+        start = min(max(start, 0), length)
+        removed = min(max(removed, 0), length - start)
+        if removed == 0 and not text:
+            return self._snapshot
+        rope = self._snapshot.rope.replace(start, start + removed, text)
+        change = DocumentChange(self.version + 1, start, removed, len(text))
+        self._apply(rope, change)
+        return self._snapshot
+
+    def insert(self, pos, text):
+        return self.replace(pos, 0, text)
+
+    def delete(self, start, end):
+        return self.replace(start, end - start, "")
+
+    def set_text(self, text):
+        """Replace the whole document, e.g. after loading a file."""
+        change = DocumentChange(self.version + 1, 0, len(self), len(text))
+        self._apply(Rope(text), change)
+        return self._snapshot
+
+    def changes_since(self, version):
+        """
+        List the edits made after a given version.
+
+        Args:
+            version (int): Version the caller last saw
+
+        Returns:
+            list: DocumentChange entries in order, or None if the log no longer
+                  reaches back that far and the caller must resync completely
+        """
+        if version == self.version:
+            return []
+        changes = [change for change in self._changes if change.version > version]
+        if not changes or changes[0].version != version + 1:
+            return None
+        return changes
+
+    def _apply(self, rope, change):
+        previous = self._snapshot
+        previous._previous = None  # Keep at most one link so old versions can be freed
+        self._snapshot = DocumentSnapshot(rope, change.version, previous, change)
+        self._changes.append(change)
+        for listener in list(self._listeners):
+            listener(self._snapshot, change)
@@ -0,0 +1,413 @@
+import os
+import sys
+import json
+import queue
+import hashlib
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource  # POSIX only; used to cap worker memory
+except ImportError:
+    resource = None
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# Number of DOCX paragraphs / TXT lines sent to the GUI per streamed chunk
+PARAGRAPHS_PER_CHUNK = 50
+LINES_PER_CHUNK = 200
+
+# Default size cap for the on-disk extraction cache
+DEFAULT_CACHE_MAX_MB = 256
+
+# Sentinel placed on the chunk queue when a document has been fully extracted
+_DONE = "__done__"
+_ERROR = "__error__"
+
+
+def _default_cache_dir():
+    """Per-user cache directory that survives reboots (unlike the temp dir)."""
+    if os.name == "nt":
+        base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "ai_text_audio_tool", "extraction_cache")
+
+
+def _limit_worker_memory(max_memory_mb):
+    """Process pool initializer that caps the address space of a worker."""
+    if resource is None or not max_memory_mb:
+        return
+    limit = int(max_memory_mb) * 1024 * 1024
+    try:
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        print(f"Could not apply worker memory limit: {e}")
+
+
+def _iter_pdf_chunks(path):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise RuntimeError("PDF support requires the 'pypdf' package.")
+
+    reader = PdfReader(path)
+    for page in reader.pages:
+        yield page.extract_text() or ""
+
+
+def _iter_docx_chunks(path):
+    try:
+        import docx
+    except ImportError:
+        raise RuntimeError("DOCX support requires the 'python-docx' package.")
+
+    document = docx.Document(path)
+    batch = []
+    for paragraph in document.paragraphs:
+        batch.append(paragraph.text)
+        if len(batch) >= PARAGRAPHS_PER_CHUNK:
+            yield "\n".join(batch)
+            batch = []
+    if batch:
+        yield "\n".join(batch)
+
+
+def _iter_txt_chunks(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        batch = []
+        for line in f:
+            batch.append(line.rstrip("\n"))
+            if len(batch) >= LINES_PER_CHUNK:
+                yield "\n".join(batch)
+                batch = []
+        if batch:
+            yield "\n".join(batch)
+
+
+_EXTRACTORS = {
+    ".pdf": _iter_pdf_chunks,
+    ".docx": _iter_docx_chunks,
+    ".txt": _iter_txt_chunks,
+}
+
+
+def _extract_to_queue(path, chunk_queue):
+    """
+    Pool task: extract a document and stream its chunks onto a shared queue.
+
+    Each message is a (path, kind, payload) tuple where kind is the chunk
+    index, _DONE once the document is finished, or _ERROR with a message.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        extractor = _EXTRACTORS[extension]
+        for index, text in enumerate(extractor(path)):
+            chunk_queue.put((path, index, text))
+        chunk_queue.put((path, _DONE, None))
+    except MemoryError:
+        chunk_queue.put((path, _ERROR, "Document exceeds the worker memory limit."))
+    except Exception as e:
+        chunk_queue.put((path, _ERROR, str(e)))
+
+
+class ExtractionCache:
+    """
+    Persistent on-disk cache of extracted document text.
+
+    Entries are keyed by (path, size, mtime, content hash), so a document is
+    only re-parsed when it has actually changed. The cache is size-capped and
+    evicts least recently used entries first.
+    """
+
+    def __init__(self, cache_dir=None, max_size_mb=None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str, optional): Directory for cache entries. Defaults to
+                                       EXTRACTION_CACHE_DIR or the per-user
+                                       cache directory.
+            max_size_mb (int, optional): Total size cap for cache entries.
+                                         Defaults to EXTRACTION_CACHE_MAX_MB or 256.
+        """
+        self.cache_dir = cache_dir or os.getenv("EXTRACTION_CACHE_DIR") or _default_cache_dir()
+        if max_size_mb is None:
+            max_size_mb = int(os.getenv("EXTRACTION_CACHE_MAX_MB", str(DEFAULT_CACHE_MAX_MB)))
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def document_key(path):
+        """
+        Build the cache key for a document.
+
+        Args:
+            path (str): Path to the document
+
+        Returns:
+            str: Hex digest identifying this exact version of the file
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        content_hash = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                content_hash.update(block)
+        key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}|{content_hash.hexdigest()}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        """
+        Look up cached chunks.
+
+        Args:
+            key (str): Key from document_key()
+
+        Returns:
+            list: Extracted text chunks, or None on a cache miss
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as f:
+                chunks = json.load(f)["chunks"]
+        except (OSError, ValueError, KeyError):
+            return None
+        try:
+            os.utime(entry_path)  # Mark as recently used for eviction
+        except OSError:
+            pass
+        return chunks
+
+    def put(self, key, chunks):
+        """
+        Store extracted chunks for a document.
+
+        Args:
+            key (str): Key from document_key()
+            chunks (list): Extracted text chunks in document order
+        """
+        entry_path = self._entry_path(key)
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"chunks": chunks}, f)
+            os.replace(temp_path, entry_path)  # Atomic so readers never see partial entries
+        except OSError as e:
+            print(f"Error writing extraction cache entry: {e}")
+            return
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used entries until the cache fits its size cap."""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                print(f"Error evicting cache entry {path}: {e}")
+
+    def clear(self):
+        """Remove all cache entries."""
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".json"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError as e:
+                    print(f"Error removing cache entry {name}: {e}")
+
+
+class DocumentService:
+    """
+    Service class for extracting text from PDF, DOCX and TXT documents.
+    Parsing runs in a process pool so large documents never block the GUI,
+    and results are cached on disk so reopening a document is instant.
+    """
+
+    def __init__(self, max_workers=None, max_worker_memory_mb=None, cache=None):
+        """
+        Initialize the document service.
+
+        Args:
+            max_workers (int, optional): Size of the extraction process pool.
+                                         Defaults to the CPU count.
+            max_worker_memory_mb (int, optional): Address space cap per worker.
+                                                  Defaults to EXTRACTION_WORKER_MEMORY_MB
+                                                  or 1024. Only enforced on POSIX.
+            cache (ExtractionCache, optional): Cache for extracted text
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_worker_memory_mb = max_worker_memory_mb or int(
+            os.getenv("EXTRACTION_WORKER_MEMORY_MB", "1024")
+        )
+        self.cache = cache or ExtractionCache()
+        self._executor = None
+        self._manager = None
+        print("Document Service Initialized")
+
+    @staticmethod
+    def is_supported(path):
+        return os.path.splitext(path)[1].lower() in SUPPORTED_EXTENSIONS
+
+    def start(self):
+        """
+        Create the worker pool ahead of the first extraction.
+
+        Workers use the "spawn" start method: forking a multithreaded Qt process
+        is unsafe, and forked children would inherit the GUI's address space,
+        leaving no headroom under the per-worker memory cap. Call this from the
+        GUI thread; otherwise the pool is created on first use.
+        """
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_limit_worker_memory,
+                initargs=(self.max_worker_memory_mb,),
+            )
+            self._manager = context.Manager()
+        return self._executor
+
+    def iter_extract(self, paths, cancel_event=None):
+        """
+        Extract text from several documents in parallel, streaming chunks.
+
+        Chunks are yielded in document order and, within a document, in page
+        or paragraph order. The first unfinished document streams as soon as
+        its pages are parsed; later documents are buffered until it is their turn.
+
+        Args:
+            paths (list): Document paths
+            cancel_event (threading.Event, optional): When set, extraction stops
+                                                      at the next chunk boundary
+
+        Yields:
+            tuple: (path, chunk_index, text) for each chunk, then
+                   (path, None, None) once a document is complete, or
+                   (path, None, error_message) if extraction failed
+        """
+        paths = list(paths)
+        keys = {}
+        buffered = {path: [] for path in paths}
+        finished = {}  # path -> error message or None
+        pending = []
+
+        for path in paths:
+            if not self.is_supported(path):
+                finished[path] = f"Unsupported document type: {os.path.basename(path)}"
+                continue
+            try:
+                keys[path] = self.cache.document_key(path)
+            except OSError as e:
+                finished[path] = str(e)
+                continue
+            chunks = self.cache.get(keys[path])
+            if chunks is not None:
+                buffered[path] = chunks
+                finished[path] = None
+            else:
+                pending.append(path)
+
+        chunk_queue = None
+        futures = {}
+        if pending:
+            executor = self.start()
+            chunk_queue = self._manager.Queue()
+            for path in set(pending):
+                futures[path] = executor.submit(_extract_to_queue, path, chunk_queue)
+
+        def cancelled():
+            return cancel_event is not None and cancel_event.is_set()
+
+        extracted = {path: [] for path in pending}
+        pool_broken = False
+        emitted = 0  # Chunks of the current document already yielded
+        for path in paths:
+            while True:
+                chunks = buffered[path]
+                while emitted < len(chunks) and not cancelled():
+                    yield path, emitted, chunks[emitted]
+                    emitted += 1
+                if cancelled():
+                    for future in futures.values():
+                        future.cancel()  # Tasks already running finish into the discarded queue
+                    return
+                if path in finished:
+                    break
+                # Current document still in progress; wait for more output
+                try:
+                    source, kind, payload = chunk_queue.get(timeout=0.5)
+                except queue.Empty:
+                    # A worker killed mid-task (e.g. by the OS) never reports back
+                    future = futures[path]
+                    if future.done() and future.exception() is not None:
+                        finished[path] = f"Extraction worker failed: {future.exception()}"
+                        pool_broken = True
+                    continue
+                if kind == _DONE:
+                    finished[source] = None
+                    self.cache.put(keys[source], extracted[source])
+                elif kind == _ERROR:
+                    finished[source] = payload
+                else:
+                    extracted[source].append(payload)
+                    buffered[source] = extracted[source]
+            yield path, None, finished[path]
+            emitted = 0
+
+        if pool_broken:
+            self.shutdown()  # A fresh pool is created on the next request
+
+    def extract_text(self, path):
+        """
+        Extract the full text of a single document.
+
+        Args:
+            path (str): Document path
+
+        Returns:
+            tuple: (text, error_message) where error_message is None on success
+        """
+        chunks = []
+        error = None
+        for _, index, payload in self.iter_extract([path]):
+            if index is None:
+                error = payload
+            else:
+                chunks.append(payload)
+        return "\n".join(chunks), error
+
+    def shutdown(self):
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
@@ -0,0 +1,215 @@
+import os
+import re
+import time
+import shutil
+import tempfile
+import subprocess
+
+
+class LocalTTSEngine:
+    """
+    Offline text-to-speech using the espeak-ng / espeak command line synthesizer.
+    Mirrors AIService.synthesize_speech so the two are interchangeable.
+    """
+
+    # Map UI voice names onto espeak voice identifiers
+    VOICES = {
+        "Default Male": "en-us+m3",
+        "Default Female": "en-us+f3",
+        "UK Male": "en-gb+m3",
+    }
+    BASE_WORDS_PER_MINUTE = 175
+
+    def __init__(self):
+        self.executable = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def is_available(self):
+        return self.executable is not None
+
+    def warm_up(self):
+        """Run a tiny synthesis so the binary and voice data are paged in."""
+        audio_file_path, _ = self.synthesize_speech("ready", "Default Male", 1.0)
+        if audio_file_path and os.path.exists(audio_file_path):
+            os.remove(audio_file_path)
+
+    def synthesize_speech(self, text, voice, speed):
+        """
+        Convert text to speech locally.
+
+        Args:
+            text (str): The text to synthesize
+            voice (str): Voice name as shown in the UI
+            speed (float): Playback speed multiplier
+
+        Returns:
+            tuple: (audio_file_path, actual_tokens) or (None, 0) on failure.
+                   Local synthesis never consumes tokens.
+        """
+        if not self.is_available():
+            print("Local TTS unavailable: espeak is not installed")
+            return None, 0
+
+        temp_file_path = os.path.join(
+            tempfile.gettempdir(), f"tts_local_{time.time_ns()}.wav"
+        )
+        command = [
+            self.executable,
+            "-v", self.VOICES.get(voice, "en-us"),
+            "-s", str(int(self.BASE_WORDS_PER_MINUTE * speed)),
+            "-w", temp_file_path,
+            "--stdin",
+        ]
+        try:
+            subprocess.run(
+                command,
+                input=text.encode("utf-8"),
+                check=True,
+                capture_output=True,
+                timeout=120,
+            )
+            return temp_file_path, 0
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Error in local speech synthesis: {e}")
+            return None, 0
+
+
+class LocalGrammarEngine:
+    """
+    Rule-based grammar and spelling correction that runs without a network.
+    Covers common mechanical mistakes only; style issues are left to the AI provider.
+    """
+
+    COMMON_MISSPELLINGS = {
+        "teh": "the",
+        "recieve": "receive",
+        "seperate": "separate",
+        "definately": "definitely",
+        "occured": "occurred",
+        "untill": "until",
+        "wich": "which",
+        "becuase": "because",
+        "accomodate": "accommodate",
+        "alot": "a lot",
+        "thier": "their",
+        "goverment": "government",
+        "adress": "address",
+        "begining": "beginning",
+        "tommorow": "tomorrow",
+    }
+
+    # Short words that are almost never legitimately repeated ("the the")
+    DOUBLED_WORDS = ("the", "a", "an", "and", "of", "to", "in", "on", "for", "with", "at", "by")
+
+    # Tokens ending in a period that do not end a sentence
+    ABBREVIATIONS = {
+        "e.g", "i.e", "etc", "vs", "cf", "approx", "incl", "mr", "mrs", "ms",
+        "dr", "prof", "st", "no", "fig", "vol",
+    }
+
+    _RULES = [
+        (re.compile(r"[ \t]{2,}"), " "),                                  # Repeated spaces
+        (re.compile(r"([,;])(?=[A-Za-z])"), r"\1 "),                      # Missing space after separators
+        (re.compile(r"[ \t]+([,.;:!?])(?=\s|$)"), r"\1"),                 # Space before punctuation
+        (re.compile(r"\b(" + "|".join(DOUBLED_WORDS) + r")(\s+\1\b)+", re.IGNORECASE), r"\1"),  # Doubled words
+        (re.compile(r"\bi\b(?=\s|'|$)"), "I"),                            # Lowercase pronoun "i"
+    ]
+    # Sentence starts: start of a paragraph, or after sentence-final punctuation.
+    # Line starts inside a paragraph are left alone so hard-wrapped text is not damaged.
+    _SENTENCE_START = re.compile(r"(\A\s*|\n[ \t]*\n\s*|(?<!\S)(\S*)[.!?]\s+)(?=[a-z])")
+    # Dotted abbreviations such as "p.m", "U.S" or "a.k.a" (final period removed)
+    _DOTTED_ABBREVIATION = re.compile(r"(?:[a-z]\.)+[a-z]", re.IGNORECASE)
+    _WORD = re.compile(r"\b[A-Za-z]+\b")
+
+    def is_available(self):
+        return True
+
+    def _fix_spelling(self, match):
+        word = match.group(0)
+        replacement = self.COMMON_MISSPELLINGS.get(word.lower())
+        if replacement is None:
+            return word
+        if word[0].isupper():
+            replacement = replacement[0].upper() + replacement[1:]
+        return replacement
+
+    def correct_grammar(self, text):
+        """
+        Perform rule-based grammar and spelling correction.
+
+        Args:
+            text (str): Text to correct
+
+        Returns:
+            tuple: (corrected_text, actual_tokens); tokens are always 0 locally
+        """
+        corrected = self._WORD.sub(self._fix_spelling, text)
+        for pattern, replacement in self._RULES:
+            corrected = pattern.sub(replacement, corrected)
+        return self._capitalize_sentences(corrected), 0
+
+    def _capitalize_sentences(self, text):
+        chars = list(text)
+        for match in self._SENTENCE_START.finditer(text):
+            previous_token = match.group(2)
+            if previous_token is not None:
+                token = previous_token.lstrip("([{\"'").lower()
+                if (token in self.ABBREVIATIONS or token.endswith(".")
+                        or self._DOTTED_ABBREVIATION.fullmatch(token)):
+                    continue  # Abbreviation or ellipsis, not a sentence end
+            chars[match.end()] = chars[match.end()].upper()
+        return "".join(chars)
+
+
+class LocalTranslationEngine:
+    """
+    Offline translation using Argos Translate language packages. Only available
+    when Argos is installed; language pairs without a package report a failure
+    so the router can use the AI provider instead.
+    """
+
+    def __init__(self):
+        try:
+            import argostranslate.translate
+            self._argos = argostranslate.translate
+        except ImportError:
+            self._argos = None
+
+    def is_available(self):
+        return self._argos is not None
+
+    def has_model(self, source_lang, target_lang):
+        """Check whether an offline package for this language pair is installed."""
+        if self._argos is None:
+            return False
+        try:
+            languages = {language.code: language for language in self._argos.get_installed_languages()}
+            source, target = languages.get(source_lang), languages.get(target_lang)
+            return source is not None and target is not None and source.get_translation(target) is not None
+        except Exception as e:
+            print(f"Error listing offline translation packages: {e}")
+            return False
+
+    def translate_text(self, text, source_lang, target_lang):
+        """
+        Translate text between languages without network access.
+
+        Args:
+            text (str): Text to translate
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+
+        Returns:
+            tuple: (translated_text, actual_tokens) or (None, 0) if no offline
+                   model is installed; tokens are always 0 locally
+        """
+        if source_lang == target_lang:
+            return text, 0
+
+        if not self.has_model(source_lang, target_lang):
+            print(f"No offline model for {source_lang} -> {target_lang}")
+            return None, 0
+        try:
+            return self._argos.translate(text, source_lang, target_lang), 0
+        except Exception as e:
+            print(f"Local translation error: {e}")
+            return None, 0
@@ -0,0 +1,400 @@
+import os
+import time
+import socket
+import threading
+
+from app.services.local_engines import (
+    LocalTTSEngine, LocalGrammarEngine, LocalTranslationEngine
+)
+
+LOCAL = "local"
+REMOTE = "remote"
+
+
+class LatencyTracker:
+    """
+    Exponentially weighted estimate of recent call latencies.
+
+    Remote calls are dominated by the network round trip, so they are tracked
+    as seconds per call. Local engines pay a fixed start-up cost (such as
+    spawning espeak) plus work that grows with the input, so with per_char set
+    latency is fitted as overhead + cost per character over recent samples.
+    Until inputs of clearly different sizes have been measured the
+    per-character cost is taken as zero; an optimistic guess gets corrected by
+    the next measurement, a pessimistic one would keep the engine unused.
+
+    With max_age set, an estimate that has not been updated for that many
+    seconds is stale, and the next sample replaces it instead of being blended in.
+    """
+
+    def __init__(self, initial_seconds=None, per_char=False, smoothing=0.3, max_age=None):
+        self.per_char = per_char
+        self.smoothing = smoothing
+        self.value = initial_seconds  # Fixed seconds per call
+        self.char_cost = 0.0  # Additional seconds per input character (per_char only)
+        self.max_age = max_age
+        self.updated_at = None
+        self._sums = None  # Decayed (weight, x, y, xx, xy) sums for the per_char fit
+
+    def record(self, elapsed, chars):
+        stale = self.value is None or self.is_stale()
+        if self.per_char:
+            self._fit(elapsed, chars, reset=stale)
+        elif stale:
+            self.value = elapsed
+        else:
+            self.value = self.smoothing * elapsed + (1 - self.smoothing) * self.value
+        self.updated_at = time.monotonic()
+
+    def _fit(self, elapsed, chars, reset):
+        # Weighted least squares for elapsed = value + char_cost * chars, with
+        # older samples decaying at the same rate as the per-call average
+        sample = (1.0, chars, elapsed, chars * chars, chars * elapsed)
+        keep = 0.0 if reset or self._sums is None else 1 - self.smoothing
+        previous = self._sums or sample
+        self._sums = tuple(keep * total + term for total, term in zip(previous, sample))
+
+        weight, sum_x, sum_y, sum_xx, sum_xy = self._sums
+        mean_x, mean_y = sum_x / weight, sum_y / weight
+        variance = sum_xx / weight - mean_x * mean_x
+        if variance > (0.25 * mean_x) ** 2:
+            self.char_cost = max((sum_xy / weight - mean_x * mean_y) / variance, 0.0)
+        else:
+            self.char_cost = 0.0  # Similar sizes cannot separate overhead from per-character cost
+        self.value = max(mean_y - self.char_cost * mean_x, 0.0)
+
+    def touch(self):
+        """Restart the age of the estimate without adding a sample, e.g. after a failed call."""
+        self.updated_at = time.monotonic()
+
+    def is_stale(self):
+        """
+        Check whether the estimate is too old (or was never measured) to trust.
+
+        Returns:
+            bool: True if max_age is set and has passed since the last update
+        """
+        if self.max_age is None:
+            return False
+        return self.updated_at is None or time.monotonic() - self.updated_at > self.max_age
+
+    def predict(self, chars):
+        """
+        Predict latency in seconds for an input of the given size.
+
+        Returns:
+            float: Predicted seconds, or None if nothing has been measured yet
+        """
+        if self.value is None:
+            return None
+        return self.value + self.char_cost * chars
+
+
+class ProviderRouter:
+    """
+    Routes TTS, grammar and translation requests between the remote AI provider
+    and local offline engines. Exposes the same methods as AIService, so modules
+    can use it as a drop-in replacement.
+
+    Per request, local engines are chosen when the app is offline, when the
+    token budget cannot cover the remote call, when the input is a short
+    snippet, or when recent remote latency is worse than the local estimate.
+    A slow remote estimate only holds for REMOTE_RETRY_INTERVAL seconds; after
+    that one request goes remote again to re-measure it.
+    """
+
+    # Seconds a slow remote latency estimate is trusted before it is re-measured
+    REMOTE_RETRY_INTERVAL = 60.0
+
+    # Seed latencies (seconds) used before any remote call has been measured
+    DEFAULT_REMOTE_LATENCY = {
+        "tts": 1.5,
+        "grammar": 0.8,
+        "translate": 1.0,
+    }
+
+    def __init__(self, ai_service, offline=None, token_budget=None,
+                 short_text_chars=None, max_remote_latency=None):
+        """
+        Initialize the router.
+
+        Args:
+            ai_service (AIService): Remote provider service
+            offline (bool, optional): Force offline mode. Defaults to OFFLINE_MODE.
+            token_budget (int, optional): Tokens available for remote calls.
+                                          Defaults to TOKEN_BUDGET; unlimited if unset.
+            short_text_chars (int, optional): Inputs up to this length are always
+                                              handled locally. Defaults to 280.
+            max_remote_latency (float, optional): Remote latency in seconds above
+                                                  which a faster local engine wins.
+                                                  Defaults to 5.0.
+        """
+        self.ai_service = ai_service
+        self.local_engines = {
+            "tts": LocalTTSEngine(),
+            "grammar": LocalGrammarEngine(),
+            "translate": LocalTranslationEngine(),
+        }
+
+        if offline is None:
+            offline = os.getenv("OFFLINE_MODE", "False").lower() == "true"
+        self.forced_offline = offline
+
+        if token_budget is None and os.getenv("TOKEN_BUDGET"):
+            token_budget = int(os.getenv("TOKEN_BUDGET"))
+        self.token_budget = token_budget  # None means unlimited
+        self.tokens_used = 0
+
+        if short_text_chars is None:
+            short_text_chars = int(os.getenv("LOCAL_SHORT_TEXT_CHARS", "280"))
+        self.short_text_chars = short_text_chars
+        self.max_remote_latency = 5.0 if max_remote_latency is None else max_remote_latency
+
+        self.latency = {
+            (operation, REMOTE): LatencyTracker(seconds, max_age=self.REMOTE_RETRY_INTERVAL)
+            for operation, seconds in self.DEFAULT_REMOTE_LATENCY.items()
+        }
+        self.latency.update({
+            (operation, LOCAL): LatencyTracker(per_char=True) for operation in self.local_engines
+        })
+
+        # Network reachability is probed in the background and cached, because
+        # routing decisions are also made on the GUI thread (token estimates)
+        self.probe_host = ("api.openai.com", 443)
+        self.probe_interval = 30.0
+        self._network_ok = True
+        self._last_probe = None
+        self._probe_thread = None
+        self._lock = threading.Lock()
+        print("Provider Router Initialized")
+
+    # --- Routing state ---
+
+    def set_offline(self, offline):
+        """Force offline mode on or off."""
+        self.forced_offline = offline
+
+    def is_offline(self):
+        """
+        Check whether remote providers are unreachable.
+
+        Returns:
+            bool: True if forced offline or the provider host cannot be reached
+        """
+        if self.forced_offline:
+            return True
+        stale = self._last_probe is None or time.monotonic() - self._last_probe > self.probe_interval
+        if stale and (self._probe_thread is None or not self._probe_thread.is_alive()):
+            self._last_probe = time.monotonic()
+            self._probe_thread = threading.Thread(target=self._probe_network, daemon=True)
+            self._probe_thread.start()
+        return not self._network_ok
+
+    def _probe_network(self):
+        try:
+            with socket.create_connection(self.probe_host, timeout=2.0):
+                self._network_ok = True
+        except OSError:
+            self._network_ok = False
+        self._last_probe = time.monotonic()
+
+    def _mark_network_failure(self):
+        # Treat the provider as unreachable until the next probe
+        self._network_ok = False
+        self._last_probe = time.monotonic()
+
+    def warm_up(self):
+        """
+        Prepare both paths for low-latency requests at start-up: page in the
+        local TTS engine and warm the provider connection.
+        Blocking; call from a worker thread.
+        """
+        if self.local_engines["tts"].is_available():
+            self.local_engines["tts"].warm_up()
+        self.refresh_connection()
+
+    def refresh_connection(self):
+        """
+        Keep the provider connection alive and the reachability probe fresh.
+        Cheap enough to call periodically. Blocking; call from a worker thread.
+        """
+        if self.is_offline():
+            return
+        try:
+            self.ai_service.warm_up()
+        except OSError as e:
+            print(f"Provider warm-up failed, provider unreachable: {e}")
+            self._mark_network_failure()
+        except Exception as e:
+            print(f"Provider warm-up failed: {e}")
+
+    def remaining_tokens(self):
+        if self.token_budget is None:
+            return None
+        return max(self.token_budget - self.tokens_used, 0)
+
+    def _estimate_remote_tokens(self, operation, text):
+        if operation == "tts":
+            return self.ai_service.estimate_tts_tokens(text, None)
+        return len(text)  # Grammar and translation bill roughly one token per character
+
+    def choose_route(self, operation, text):
+        """
+        Decide whether a request should run locally or remotely.
+
+        Args:
+            operation (str): "tts", "grammar" or "translate"
+            text (str): Input text
+
+        Returns:
+            str: LOCAL or REMOTE
+        """
+        if not self.local_engines[operation].is_available():
+            return REMOTE
+        if len(text) <= self.short_text_chars:
+            return LOCAL  # Not worth a network round trip
+        if self.is_offline():
+            return LOCAL
+
+        remaining = self.remaining_tokens()
+        if remaining is not None and self._estimate_remote_tokens(operation, text) > remaining:
+            return LOCAL
+
+        with self._lock:
+            remote = self.latency[(operation, REMOTE)]
+            remote_prediction = remote.predict(len(text))
+            local_prediction = self.latency[(operation, LOCAL)].predict(len(text))
+            remote_stale = remote.is_stale()
+        if (remote_prediction is not None and remote_prediction > self.max_remote_latency
+                and (local_prediction is None or local_prediction < remote_prediction)):
+            # Local calls never update the remote estimate, so let a request
+            # through once it is stale rather than staying local for good
+            return REMOTE if remote_stale else LOCAL
+        return REMOTE
+
+    def _remote_allowed(self, operation, text):
+        if self.is_offline():
+            return False
+        remaining = self.remaining_tokens()
+        return remaining is None or self._estimate_remote_tokens(operation, text) <= remaining
+
+    def _call_remote(self, operation, text, remote_call):
+        start = time.perf_counter()
+        try:
+            result, tokens = remote_call()
+        except OSError as e:
+            # Connection errors (refused, reset, DNS, timeouts) mean the provider
+            # is unreachable, so route everything locally until the next probe
+            print(f"Remote {operation} failed, provider unreachable: {e}")
+            self._mark_network_failure()
+            result, tokens = None, 0
+        except Exception as e:
+            print(f"Remote {operation} failed: {e}")
+            result, tokens = None, 0
+        with self._lock:
+            if result is not None:
+                self.latency[(operation, REMOTE)].record(time.perf_counter() - start, len(text))
+                self.tokens_used += tokens
+            else:
+                self.latency[(operation, REMOTE)].touch()  # Do not retry a failing provider on every request
+        return result, tokens
+
+    def _call_local(self, operation, text, local_call):
+        start = time.perf_counter()
+        try:
+            result, tokens = local_call()
+        except Exception as e:
+            print(f"Local {operation} failed: {e}")
+            result, tokens = None, 0
+        if result is not None:
+            with self._lock:
+                self.latency[(operation, LOCAL)].record(time.perf_counter() - start, len(text))
+        return result, tokens
+
+    def _run(self, operation, text, remote_call, local_call):
+        # Try the chosen route first and fail over to the other one
+        if self.choose_route(operation, text) == REMOTE:
+            result, tokens = self._call_remote(operation, text, remote_call)
+            if result is not None or not self.local_engines[operation].is_available():
+                return result, tokens
+            print(f"Falling back to local {operation} engine")
+            return self._call_local(operation, text, local_call)
+
+        result, tokens = self._call_local(operation, text, local_call)
+        if result is not None or not self._remote_allowed(operation, text):
+            return result, tokens
+        print(f"Falling back to remote {operation} provider")
+        return self._call_remote(operation, text, remote_call)
+
+    # --- AIService-compatible interface ---
+
+    def estimate_tts_tokens(self, text, voice):
+        """
+        Estimate token usage for text-to-speech, taking routing into account.
+
+        Args:
+            text (str): The text to be synthesized
+            voice (str): Voice ID or name
+
+        Returns:
+            int: Estimated token count (0 when the request would run locally)
+        """
+        if text and self.choose_route("tts", text) == LOCAL:
+            return 0
+        return self.ai_service.estimate_tts_tokens(text, voice)
+
+    def synthesize_speech(self, text, voice, speed):
+        """
+        Convert text to speech on the best available engine.
+
+        Args:
+            text (str): The text to synthesize
+            voice (str): Voice ID or name
+            speed (float): Playback speed multiplier
+
+        Returns:
+            tuple: (audio_file_path, actual_tokens) or (None, 0) on failure
+        """
+        return self._run(
+            "tts", text,
+            lambda: self.ai_service.synthesize_speech(text, voice, speed),
+            lambda: self.local_engines["tts"].synthesize_speech(text, voice, speed),
+        )
+
+    def correct_grammar(self, text):
+        """
+        Perform grammar and spelling correction on the best available engine.
+
+        Args:
+            text (str): Text to correct
+
+        Returns:
+            tuple: (corrected_text, actual_tokens) or (None, 0) on failure
+        """
+        return self._run(
+            "grammar", text,
+            lambda: self.ai_service.correct_grammar(text),
+            lambda: self.local_engines["grammar"].correct_grammar(text),
+        )
+
+    def translate_text(self, text, source_lang, target_lang):
+        """
+        Translate text between languages on the best available engine.
+
+        Args:
+            text (str): Text to translate
+            source_lang (str): Source language code
+            target_lang (str): Target language code
+
+        Returns:
+            tuple: (translated_text, actual_tokens) or (None, 0) on failure
+        """
+        return self._run(
+            "translate", text,
+            lambda: self.ai_service.translate_text(text, source_lang, target_lang),
+            lambda: self.local_engines["translate"].translate_text(text, source_lang, target_lang),
+        )
+
+    def __getattr__(self, name):
+        # Features without a local engine (STT, rewriting, Ask AI) go straight to the provider
+        return getattr(self.ai_service, name)
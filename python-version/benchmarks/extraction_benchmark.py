@@ -0,0 +1,172 @@
+"""
+Throughput benchmark for the document extraction service.
+
+Generates a corpus of TXT, DOCX and PDF test documents, then measures
+extraction throughput with a cold cache and again with a warm cache.
+
+Usage (from the python-version directory):
+    python -m benchmarks.extraction_benchmark --documents 12 --pages 300
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.document_service import DocumentService, ExtractionCache
+
+SAMPLE_SENTENCE = (
+    "The quick brown fox jumps over the lazy dog while the narrator reads "
+    "this paragraph aloud for accessibility testing."
+)
+LINES_PER_PAGE = 40
+
+
+def _page_lines(doc_index, page_index):
+    return [
+        f"Document {doc_index} page {page_index} line {line}: {SAMPLE_SENTENCE}"
+        for line in range(LINES_PER_PAGE)
+    ]
+
+
+def write_txt(path, doc_index, pages):
+    with open(path, "w", encoding="utf-8") as f:
+        for page in range(pages):
+            f.write("\n".join(_page_lines(doc_index, page)) + "\n")
+
+
+def write_docx(path, doc_index, pages):
+    import docx
+
+    document = docx.Document()
+    for page in range(pages):
+        for line in _page_lines(doc_index, page):
+            document.add_paragraph(line)
+    document.save(path)
+
+
+def write_pdf(path, doc_index, pages):
+    """Write a minimal multi-page PDF without any third-party dependency."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_numbers = []
+    for page in range(pages):
+        text_ops = ["BT /F1 9 Tf 11 TL 36 800 Td"]
+        for line in _page_lines(doc_index, page):
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            text_ops.append(f"({escaped}) Tj T*")
+        text_ops.append("ET")
+        stream = "\n".join(text_ops).encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_number = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_number
+        )
+        page_numbers.append(len(objects))
+    kids = " ".join(f"{number} 0 R" for number in page_numbers).encode("ascii")
+    objects[1] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_numbers)
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref_offset = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\n" % (len(objects) + 1))
+        f.write(b"startxref\n%d\n%%%%EOF\n" % xref_offset)
+
+
+WRITERS = {
+    ".txt": write_txt,
+    ".docx": write_docx,
+    ".pdf": write_pdf,
+}
+
+
+def build_corpus(directory, documents, pages):
+    """
+    Generate test documents, skipping formats whose libraries are missing.
+
+    Returns:
+        list: Paths of the generated documents
+    """
+    paths = []
+    for index in range(documents):
+        extension = list(WRITERS)[index % len(WRITERS)]
+        path = os.path.join(directory, f"document_{index}{extension}")
+        try:
+            WRITERS[extension](path, index, pages)
+        except ImportError:
+            print(f"Skipping {extension} document: generator library not installed")
+            continue
+        paths.append(path)
+    return paths
+
+
+def run_pass(service, paths):
+    """
+    Extract every document once.
+
+    Returns:
+        tuple: (elapsed_seconds, chunk_count, character_count, errors)
+    """
+    chunks = 0
+    characters = 0
+    errors = []
+    start = time.perf_counter()
+    for path, index, payload in service.iter_extract(paths):
+        if index is None:
+            if payload:
+                errors.append(f"{os.path.basename(path)}: {payload}")
+        else:
+            chunks += 1
+            characters += len(payload)
+    return time.perf_counter() - start, chunks, characters, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark document text extraction.")
+    parser.add_argument("--documents", type=int, default=12, help="Number of documents to generate")
+    parser.add_argument("--pages", type=int, default=300, help="Pages per document")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction process count")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="extraction_benchmark_")
+    try:
+        corpus_dir = os.path.join(work_dir, "corpus")
+        os.makedirs(corpus_dir)
+        paths = build_corpus(corpus_dir, args.documents, args.pages)
+        corpus_mb = sum(os.path.getsize(path) for path in paths) / (1024 * 1024)
+        print(f"Generated {len(paths)} documents ({corpus_mb:.1f} MB) in {corpus_dir}")
+
+        cache = ExtractionCache(os.path.join(work_dir, "cache"))
+        service = DocumentService(max_workers=args.workers, cache=cache)
+        try:
+            for label in ("Cold cache", "Warm cache"):
+                elapsed, chunks, characters, errors = run_pass(service, paths)
+                print(
+                    f"{label}: {elapsed:.3f}s, {len(paths) / elapsed:.1f} docs/s, "
+                    f"{chunks / elapsed:.0f} chunks/s, {corpus_mb / elapsed:.1f} MB/s, "
+                    f"{characters} characters"
+                )
+                for error in errors:
+                    print(f"  Error: {error}")
+        finally:
+            service.shutdown()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PyQt6.QtWidgets import QApplication
 from app.main_window import MainWindow
 
@@ -22,4 +23,6 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    # Required for the document extraction process pool in frozen executables
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import random
+import unittest
+
+from app.services import document_model
+from app.services.document_model import (
+    Rope, DocumentModel, DocumentChange, CHANGE_LOG_SIZE, LEAF_SIZE
+)
+
+
+def check_balanced(node):
+    """Assert AVL balance and cached lengths; return the subtree height."""
+    if node is None or isinstance(node, document_model._Leaf):
+        return 0
+    left = check_balanced(node.left)
+    right = check_balanced(node.right)
+    assert abs(left - right) <= 1, (left, right)
+    assert node.height == max(left, right) + 1
+    assert node.length == node.left.length + node.right.length
+    return node.height
+
+
+class RopeTests(unittest.TestCase):
+    def test_random_edits_match_str(self):
+        rng = random.Random(1)
+        text = "".join(rng.choice("abc\n") for _ in range(5000))
+        rope = Rope(text)
+        versions = []
+        for step in range(5000):
+            length = len(text)
+            op = rng.random()
+            if op < 0.5:
+                pos = rng.randint(0, length)
+                insert = "".join(rng.choice("xyz\n") for _ in range(rng.choice([1, 1, 5, LEAF_SIZE * 3])))
+                rope = rope.insert(pos, insert)
+                text = text[:pos] + insert + text[pos:]
+            elif op < 0.9:
+                start = rng.randint(0, length)
+                end = min(length, start + rng.choice([1, 2, 50, LEAF_SIZE * 4]))
+                rope = rope.delete(start, end)
+                text = text[:start] + text[end:]
+            else:
+                start = rng.randint(0, length)
+                end = min(length, start + rng.randint(0, 30))
+                replacement = "q" * rng.randint(0, 10)
+                rope = rope.replace(start, end, replacement)
+                text = text[:start] + replacement + text[end:]
+
+            self.assertEqual(len(rope), len(text))
+            if step % 250 == 0:
+                self.assertEqual(str(rope), text)
+                check_balanced(rope._root)
+                start = rng.randint(0, len(text))
+                self.assertEqual(rope.slice(start, start + 77), text[start:start + 77])
+                versions.append((rope, text))
+
+        # Earlier versions are unaffected by later edits
+        for old_rope, old_text in versions:
+            self.assertEqual(str(old_rope), old_text)
+
+    def test_empty_rope(self):
+        rope = Rope()
+        self.assertEqual(len(rope), 0)
+        self.assertEqual(str(rope), "")
+        self.assertEqual(str(rope.insert(5, "abc")), "abc")
+        self.assertEqual(str(rope.delete(0, 10)), "")
+
+
+class DocumentModelTests(unittest.TestCase):
+    def test_snapshots_are_immutable(self):
+        model = DocumentModel("hello world")
+        before = model.snapshot()
+        model.insert(5, ",")
+        self.assertEqual(before.text(), "hello world")
+        self.assertEqual(model.snapshot().text(), "hello, world")
+        self.assertEqual(model.snapshot()[0:6], "hello,")
+        self.assertEqual(model.version, before.version + 1)
+
+    def test_listeners_receive_change_ranges(self):
+        model = DocumentModel("abcdef")
+        received = []
+        model.add_listener(lambda snapshot, change: received.append(change))
+        model.replace(2, 3, "XY")
+        self.assertEqual(received, [DocumentChange(1, 2, 3, 2)])
+
+    def test_changes_since(self):
+        model = DocumentModel()
+        model.insert(0, "a")
+        model.insert(1, "b")
+        self.assertEqual(model.changes_since(model.version), [])
+        self.assertEqual([change.version for change in model.changes_since(0)], [1, 2])
+
+    def test_changes_since_past_log_limit_requires_resync(self):
+        model = DocumentModel()
+        for i in range(CHANGE_LOG_SIZE + 10):
+            model.insert(i, "x")
+        self.assertIsNone(model.changes_since(0))
+        self.assertIsNone(model.changes_since(9))
+        recent = model.changes_since(10)
+        self.assertEqual(len(recent), CHANGE_LOG_SIZE)
+        self.assertEqual(recent[-1].version, model.version)
+
+    def test_block_hashes_carried_forward_match_full_rehash(self):
+        rng = random.Random(3)
+        text = "".join(rng.choice("ab\n") for _ in range(2000))
+        model = DocumentModel(text)
+        for step in range(2000):
+            length = len(text)
+            if rng.random() < 0.5:
+                pos = rng.randint(0, length)
+                insert = "".join(rng.choice("xy\n") for _ in range(rng.choice([1, 3, 40])))
+                model.insert(pos, insert)
+                text = text[:pos] + insert + text[pos:]
+            else:
+                start = rng.randint(0, length)
+                end = min(length, start + rng.choice([1, 2, 30]))
+                model.delete(start, end)
+                text = text[:start] + text[end:]
+            if rng.random() < 0.8:  # Skipped snapshots exercise the full rehash path
+                snapshot = model.snapshot()
+                spans, digests = document_model._hash_blocks(text)
+                self.assertEqual(snapshot.block_hashes(), digests)
+                self.assertEqual(snapshot.block_lengths(), [span - 1 for span in spans])
+
+    def test_over_reported_removal_is_clamped(self):
+        model = DocumentModel("abc\ndef")
+        model.snapshot().block_hashes()
+        received = []
+        model.add_listener(lambda snapshot, change: received.append(change))
+        model.replace(4, 4, "ghij")  # Only 3 characters exist after offset 4
+        self.assertEqual(received, [DocumentChange(1, 4, 3, 4)])
+        snapshot = model.snapshot()
+        self.assertEqual(snapshot.text(), "abc\nghij")
+        spans, digests = document_model._hash_blocks("abc\nghij")
+        self.assertEqual(snapshot.block_lengths(), [3, 4])
+        self.assertEqual(snapshot.block_hashes(), digests)
+
+    def test_out_of_range_start_is_clamped(self):
+        model = DocumentModel("abc")
+        received = []
+        model.add_listener(lambda snapshot, change: received.append(change))
+        model.replace(10, 5, "d")
+        self.assertEqual(received, [DocumentChange(1, 3, 0, 1)])
+        self.assertEqual(model.snapshot().text(), "abcd")
+
+    def test_block_hashes_only_change_for_edited_blocks(self):
+        model = DocumentModel("first\nsecond\nthird")
+        before = model.snapshot().block_hashes()
+        model.insert(len("first\nsec"), "X")
+        after = model.snapshot().block_hashes()
+        self.assertEqual(after[0], before[0])
+        self.assertNotEqual(after[1], before[1])
+        self.assertEqual(after[2], before[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from app.services.document_service import (
+    DocumentService, ExtractionCache, LINES_PER_CHUNK
+)
+
+
+def write_file(path, text):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return path
+
+
+class ExtractionCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+
+    def test_key_changes_with_content_and_mtime(self):
+        path = write_file(os.path.join(self.temp_dir.name, "doc.txt"), "hello")
+        stat = os.stat(path)
+        key = ExtractionCache.document_key(path)
+        self.assertEqual(ExtractionCache.document_key(path), key)
+
+        # Same size and mtime, different content
+        write_file(path, "jello")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        content_key = ExtractionCache.document_key(path)
+        self.assertNotEqual(content_key, key)
+
+        # Same content, different mtime
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertNotEqual(ExtractionCache.document_key(path), content_key)
+
+    def test_round_trip(self):
+        cache = ExtractionCache(self.cache_dir, max_size_mb=1)
+        self.assertIsNone(cache.get("missing"))
+        cache.put("key", ["first", "second"])
+        self.assertEqual(cache.get("key"), ["first", "second"])
+
+    def test_evicts_least_recently_used_entries(self):
+        chunk = "x" * 400
+        cache = ExtractionCache(self.cache_dir, max_size_mb=1000 / (1024 * 1024))  # Room for two entries
+        cache.put("a", [chunk])
+        cache.put("b", [chunk])
+        os.utime(cache._entry_path("a"), (1000, 1000))
+        os.utime(cache._entry_path("b"), (2000, 2000))
+
+        self.assertIsNotNone(cache.get("a"))  # Now the most recently used
+        cache.put("c", [chunk])
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+
+class DocumentServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.cache = ExtractionCache(os.path.join(self.temp_dir.name, "cache"), max_size_mb=16)
+        self.service = DocumentService(max_workers=2, cache=self.cache)
+        self.addCleanup(self.service.shutdown)
+
+    def path(self, name, text=None):
+        path = os.path.join(self.temp_dir.name, name)
+        return write_file(path, text) if text is not None else path
+
+    def test_documents_are_emitted_in_order(self):
+        lines = [f"line {i}" for i in range(LINES_PER_CHUNK * 3)]
+        big = self.path("big.txt", "\n".join(lines))
+        small = self.path("small.txt", "small")
+        unsupported = self.path("notes.md", "# notes")
+        broken = self.path("broken.pdf", "not a pdf")
+        missing = self.path("missing.txt")
+        paths = [unsupported, big, broken, missing, small]
+
+        results = list(self.service.iter_extract(paths))
+
+        # Each document's chunks are followed by its completion marker, in input order
+        order = [path for path, index, _ in results if index is None]
+        self.assertEqual(order, paths)
+        by_path = {}
+        for path, index, payload in results:
+            by_path.setdefault(path, []).append((index, payload))
+
+        self.assertIn("Unsupported", by_path[unsupported][0][1])
+        self.assertEqual(len(by_path[broken]), 1)
+        self.assertIsNotNone(by_path[broken][0][1])
+        self.assertEqual(len(by_path[missing]), 1)
+        self.assertIsNotNone(by_path[missing][0][1])
+
+        big_chunks = by_path[big]
+        self.assertEqual([index for index, _ in big_chunks[:-1]], [0, 1, 2])
+        self.assertEqual("\n".join(text for _, text in big_chunks[:-1]), "\n".join(lines))
+        self.assertEqual(big_chunks[-1], (None, None))
+        self.assertEqual(by_path[small], [(0, "small"), (None, None)])
+
+    def test_cached_documents_skip_the_worker_pool(self):
+        path = self.path("doc.txt", "cached text")
+        self.assertEqual(self.service.extract_text(path), ("cached text", None))
+        self.service.shutdown()
+
+        self.assertEqual(self.service.extract_text(path), ("cached text", None))
+        self.assertIsNone(self.service._executor)
+
+    def test_cancel_stops_output_and_skips_cache_write(self):
+        path = self.path("big.txt", "\n".join("line" for _ in range(LINES_PER_CHUNK * 5)))
+        cancel_event = threading.Event()
+
+        results = []
+        for result in self.service.iter_extract([path], cancel_event=cancel_event):
+            results.append(result)
+            cancel_event.set()
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][1], 0)
+        self.assertIsNone(self.cache.get(ExtractionCache.document_key(path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
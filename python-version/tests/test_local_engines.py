@@ -0,0 +1,52 @@
+import unittest
+
+from app.services.local_engines import LocalGrammarEngine, LocalTranslationEngine
+
+
+class LocalGrammarEngineTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = LocalGrammarEngine()
+
+    def correct(self, text):
+        corrected, tokens = self.engine.correct_grammar(text)
+        self.assertEqual(tokens, 0)
+        return corrected
+
+    def test_fixes_mechanical_mistakes(self):
+        self.assertEqual(
+            self.correct("i recieve teh the mail ,today. it is ok!  yes"),
+            "I receive the mail, today. It is ok! Yes",
+        )
+
+    def test_leaves_correct_text_alone(self):
+        for text in (
+            "Open the .txt file or use .NET",
+            "He said that that was fine",
+            "1 1",
+            "Pay a one-time fee",
+            "Grains, e.g. wheat, are fine.",
+            "Ask Dr. smith... then wait",
+            "A hard-wrapped line\ncontinues here.",
+            "Call me at 5 p.m. tomorrow",
+            "The U.S. army",
+            "Use it (i.e. rarely) today",
+        ):
+            self.assertEqual(self.correct(text), text)
+
+    def test_capitalizes_paragraph_starts(self):
+        self.assertEqual(self.correct("first.\n\nsecond"), "First.\n\nSecond")
+
+
+class LocalTranslationEngineTests(unittest.TestCase):
+    def test_missing_model_reports_failure(self):
+        engine = LocalTranslationEngine()
+        engine._argos = None
+        self.assertFalse(engine.is_available())
+        self.assertEqual(engine.translate_text("Hello", "en", "fr"), (None, 0))
+
+    def test_same_language_is_passthrough(self):
+        self.assertEqual(LocalTranslationEngine().translate_text("Hello", "en", "en"), ("Hello", 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,260 @@
+import unittest
+from unittest import mock
+
+from app.services.provider_router import ProviderRouter, LatencyTracker, LOCAL, REMOTE
+
+LONG_TEXT = "word " * 200  # 1000 characters, above the short-text threshold
+
+
+class FakeAIService:
+    """Stand-in for AIService that records calls instead of sleeping."""
+
+    def __init__(self, fail=False, error=None):
+        self.fail = fail
+        self.error = error
+        self.calls = []
+
+    def warm_up(self):
+        self.calls.append("warm_up")
+        return True
+
+    def estimate_tts_tokens(self, text, voice):
+        return len(text)
+
+    def correct_grammar(self, text):
+        self.calls.append("grammar")
+        if self.error is not None:
+            raise self.error
+        return (None, 0) if self.fail else (f"remote:{text}", len(text))
+
+
+class FakeLocalEngine:
+    def __init__(self, available=True, fail=False):
+        self.available = available
+        self.fail = fail
+        self.calls = 0
+
+    def is_available(self):
+        return self.available
+
+    def warm_up(self):
+        self.calls += 1
+
+    def correct_grammar(self, text):
+        self.calls += 1
+        return (None, 0) if self.fail else (f"local:{text}", 0)
+
+
+def make_router(ai_service=None, offline=False, **kwargs):
+    router = ProviderRouter(ai_service or FakeAIService(), offline=False, **kwargs)
+    # Avoid real network probes; tests control reachability directly
+    patcher = mock.patch.object(router, "is_offline", return_value=offline)
+    patcher.start()
+    return router, patcher
+
+
+class LatencyTrackerTests(unittest.TestCase):
+    def test_short_samples_do_not_extrapolate_per_character(self):
+        tracker = LatencyTracker(per_char=True)
+        tracker.record(0.05, 10)
+        tracker.record(0.06, 12)
+        self.assertLess(tracker.predict(10000), 0.1)
+
+    def test_overhead_and_per_character_cost_are_separated(self):
+        tracker = LatencyTracker(per_char=True)
+        for chars in (10, 1000, 10, 5000, 100):
+            tracker.record(0.05 + 0.0001 * chars, chars)
+        self.assertAlmostEqual(tracker.value, 0.05)
+        self.assertAlmostEqual(tracker.predict(20000), 2.05)
+
+    def test_per_call_tracker_ignores_size(self):
+        tracker = LatencyTracker(1.0)
+        tracker.record(2.0, 10)
+        self.assertAlmostEqual(tracker.predict(10), tracker.predict(100000))
+
+
+class ChooseRouteTests(unittest.TestCase):
+    def setUp(self):
+        self.patchers = []
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def router(self, **kwargs):
+        router, patcher = make_router(**kwargs)
+        self.patchers.append(patcher)
+        return router
+
+    def test_short_text_is_local(self):
+        router = self.router()
+        self.assertEqual(router.choose_route("grammar", "Fix this."), LOCAL)
+
+    def test_long_text_online_is_remote(self):
+        router = self.router()
+        self.assertEqual(router.choose_route("grammar", LONG_TEXT), REMOTE)
+
+    def test_explicit_zero_short_text_threshold_is_respected(self):
+        router = self.router(short_text_chars=0)
+        self.assertEqual(router.short_text_chars, 0)
+        self.assertEqual(router.choose_route("grammar", "Fix this."), REMOTE)
+
+    def test_offline_is_local(self):
+        router = self.router(offline=True)
+        self.assertEqual(router.choose_route("grammar", LONG_TEXT), LOCAL)
+
+    def test_exhausted_token_budget_is_local(self):
+        router = self.router(token_budget=len(LONG_TEXT) - 1)
+        self.assertEqual(router.choose_route("grammar", LONG_TEXT), LOCAL)
+
+    def test_sufficient_token_budget_is_remote(self):
+        router = self.router(token_budget=len(LONG_TEXT))
+        self.assertEqual(router.choose_route("grammar", LONG_TEXT), REMOTE)
+
+    def test_slow_remote_is_local(self):
+        router = self.router(max_remote_latency=2.0)
+        router.latency[("grammar", REMOTE)].record(10.0, len(LONG_TEXT))
+        router.latency[("grammar", LOCAL)].record(0.01, len(LONG_TEXT))
+        self.assertEqual(router.choose_route("grammar", LONG_TEXT), LOCAL)
+
+    def test_slow_remote_beats_short_local_samples_for_long_text(self):
+        router = self.router(max_remote_latency=5.0)
+        router.local_engines["tts"] = FakeLocalEngine()
+        router.latency[("tts", REMOTE)].record(8.0, 10000)
+        router.latency[("tts", LOCAL)].record(0.05, 10)  # Mostly process start-up
+        self.assertEqual(router.choose_route("tts", "word " * 2000), LOCAL)
+
+    def test_slow_remote_but_slower_local_is_remote(self):
+        router = self.router(max_remote_latency=2.0)
+        router.latency[("grammar", REMOTE)].value = 3.0
+        router.latency[("grammar", LOCAL)].record(30.0, len(LONG_TEXT))
+        self.assertEqual(router.choose_route("grammar", LONG_TEXT), REMOTE)
+
+    def test_stale_slow_remote_is_retried(self):
+        router = self.router(max_remote_latency=2.0)
+        remote = router.latency[("grammar", REMOTE)]
+        remote.record(10.0, len(LONG_TEXT))
+        router.latency[("grammar", LOCAL)].record(0.01, len(LONG_TEXT))
+        remote.updated_at -= router.REMOTE_RETRY_INTERVAL + 1
+        self.assertEqual(router.choose_route("grammar", LONG_TEXT), REMOTE)
+
+    def test_unavailable_local_engine_is_remote(self):
+        router = self.router(offline=True)
+        router.local_engines["grammar"] = FakeLocalEngine(available=False)
+        self.assertEqual(router.choose_route("grammar", "Fix this."), REMOTE)
+
+
+class FailoverTests(unittest.TestCase):
+    def setUp(self):
+        self.patchers = []
+
+    def tearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    def router(self, **kwargs):
+        router, patcher = make_router(**kwargs)
+        self.patchers.append(patcher)
+        return router
+
+    def test_local_failure_falls_back_to_remote(self):
+        ai_service = FakeAIService()
+        router = self.router(ai_service=ai_service)
+        router.local_engines["grammar"] = FakeLocalEngine(fail=True)
+        self.assertEqual(router.correct_grammar("Fix this."), ("remote:Fix this.", 9))
+        self.assertEqual(router.tokens_used, 9)
+
+    def test_local_failure_offline_reports_failure(self):
+        ai_service = FakeAIService()
+        router = self.router(ai_service=ai_service, offline=True)
+        router.local_engines["grammar"] = FakeLocalEngine(fail=True)
+        self.assertEqual(router.correct_grammar("Fix this."), (None, 0))
+        self.assertEqual(ai_service.calls, [])
+
+    def test_remote_failure_falls_back_to_local(self):
+        router = self.router(ai_service=FakeAIService(fail=True))
+        local = FakeLocalEngine()
+        router.local_engines["grammar"] = local
+        result, tokens = router.correct_grammar(LONG_TEXT)
+        self.assertEqual(result, f"local:{LONG_TEXT}")
+        self.assertEqual(tokens, 0)
+        self.assertEqual(local.calls, 1)
+
+    def test_routing_recovers_after_slow_remote_period(self):
+        ai_service = FakeAIService()
+        router = self.router(ai_service=ai_service, max_remote_latency=2.0)
+        router.local_engines["grammar"] = FakeLocalEngine()
+        remote = router.latency[("grammar", REMOTE)]
+        remote.record(8.0, len(LONG_TEXT))
+        router.latency[("grammar", LOCAL)].record(0.01, len(LONG_TEXT))
+
+        for _ in range(5):
+            router.correct_grammar(LONG_TEXT)
+        self.assertEqual(ai_service.calls, [])
+        self.assertEqual(remote.predict(len(LONG_TEXT)), 8.0)
+
+        # Once the slow estimate ages out, one request re-measures the provider
+        remote.updated_at -= router.REMOTE_RETRY_INTERVAL + 1
+        router.correct_grammar(LONG_TEXT)
+        self.assertEqual(ai_service.calls, ["grammar"])
+        self.assertLess(remote.predict(len(LONG_TEXT)), router.max_remote_latency)
+        self.assertEqual(router.choose_route("grammar", LONG_TEXT), REMOTE)
+
+    def test_failed_retry_waits_for_next_interval(self):
+        ai_service = FakeAIService(fail=True)
+        router = self.router(ai_service=ai_service, max_remote_latency=2.0)
+        router.local_engines["grammar"] = FakeLocalEngine()
+        remote = router.latency[("grammar", REMOTE)]
+        remote.record(8.0, len(LONG_TEXT))
+        router.latency[("grammar", LOCAL)].record(0.01, len(LONG_TEXT))
+        remote.updated_at -= router.REMOTE_RETRY_INTERVAL + 1
+
+        router.correct_grammar(LONG_TEXT)
+        router.correct_grammar(LONG_TEXT)
+        self.assertEqual(ai_service.calls, ["grammar"])
+
+    def test_provider_error_fails_over_for_that_request_only(self):
+        router = self.router(ai_service=FakeAIService(fail=True))
+        router.local_engines["grammar"] = FakeLocalEngine()
+        router.correct_grammar(LONG_TEXT)
+        self.assertTrue(router._network_ok)
+
+    def test_connection_error_marks_provider_unreachable(self):
+        router = self.router(ai_service=FakeAIService(error=ConnectionRefusedError("refused")))
+        router.local_engines["grammar"] = FakeLocalEngine()
+        result, _ = router.correct_grammar(LONG_TEXT)
+        self.assertEqual(result, f"local:{LONG_TEXT}")
+        self.assertFalse(router._network_ok)
+
+
+class WarmUpTests(unittest.TestCase):
+    def test_refresh_connection_skips_local_engines(self):
+        ai_service = FakeAIService()
+        router, patcher = make_router(ai_service=ai_service)
+        self.addCleanup(patcher.stop)
+        local_tts = FakeLocalEngine()
+        router.local_engines["tts"] = local_tts
+        router.refresh_connection()
+        self.assertEqual(ai_service.calls, ["warm_up"])
+        self.assertEqual(local_tts.calls, 0)
+
+    def test_warm_up_prepares_local_engine_and_provider(self):
+        ai_service = FakeAIService()
+        router, patcher = make_router(ai_service=ai_service)
+        self.addCleanup(patcher.stop)
+        local_tts = FakeLocalEngine()
+        router.local_engines["tts"] = local_tts
+        router.warm_up()
+        self.assertEqual(ai_service.calls, ["warm_up"])
+        self.assertEqual(local_tts.calls, 1)
+
+    def test_refresh_connection_offline_does_not_touch_provider(self):
+        ai_service = FakeAIService()
+        router, patcher = make_router(ai_service=ai_service, offline=True)
+        self.addCleanup(patcher.stop)
+        router.refresh_connection()
+        self.assertEqual(ai_service.calls, [])
+
+
+if __name__ == "__main__":
+    unittest.main()